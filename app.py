@@ -1,10 +1,23 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
-import base64
-import os
+import json
+import time
+
+from assets import avatar_url, static_url
+from china_forecast import read_china_forecast
+from figures import (
+    COMPARE_METRICS, FIGURE_CACHE, PROGRAM_TREE_CACHE, RACE_ORDERS, build_treemap, compact_figure,
+    comparison_figure, country_options, drilldown_rows, full_id, medal_race_figure, overview_figures,
+    program_tree_json, sunburst_figure, treemap_levels, treemap_nodes, treemap_rows, view_rows,
+)
+from live import feed_path, rerun_fragments, start_feed
+from olympic_data import file_signature, get_store
+from perf import RunProfile, new_history
+from projection import ready_projection
+from search import search_index
+from warmup import start as start_warmup
 
 # ==========================================
 # 0. Page Config
@@ -16,248 +29,21 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# Per-section timings for this run; shown in the debug panel with ?debug=1
+DEBUG = st.query_params.get("debug") == "1"
+if "perf_history" not in st.session_state:
+    st.session_state["perf_history"] = new_history()
+profile = RunProfile("page", st.session_state["perf_history"])
+
 # ==========================================
 # 1. CSS & Assets (The Visual Magic)
 # ==========================================
 
-# Helper to encode images for CSS usage
-def get_base64_of_bin_file(bin_file):
-    try:
-        with open(bin_file, 'rb') as f:
-            data = f.read()
-        return base64.b64encode(data).decode()
-    except:
-        return ""
-
-# Try to load local assets if they exist
-snowflake_img = get_base64_of_bin_file("assets/snowflake_nav.png")
-if snowflake_img:
-    snowflake_css_url = f"data:image/png;base64,{snowflake_img}"
-else:
-    # Use a large SVG data URI for reliability
-    snowflake_svg = '''
-    <svg viewBox="0 0 24 24" fill="none" xmlns="http://www.w3.org/2000/svg">
-    <path d="M12 2V22M2 12H22M4.92893 4.92893L19.0711 19.0711M19.0711 4.92893L4.92893 19.0711" stroke="rgba(255,255,255,0.1)" stroke-width="2" stroke-linecap="round"/>
-    <path d="M12 2L10 5H14L12 2ZM12 22L10 19H14L12 22Z" fill="rgba(255,255,255,0.1)"/>
-    </svg>
-    '''
-    snowflake_css_url = "https://img.icons8.com/ios/100/ffffff/snowflake.png" 
-
 # Milan 2026 Theme (Sunset/Purple) - FIXED DEFAULT
-bg_gradient = "linear-gradient(135deg, #1a2980 0%, #26d0ce 30%, #764ba2 100%)" # Deep Blue to Ice to Purple
-
-# CSS Injection
-st.markdown(f"""
-<style>
-    /* Import Google Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Montserrat:wght@300;400;700;900&family=Lato:wght@300;400;700&family=Playfair+Display:ital,wght@1,700&display=swap');
-
-    /* -------------------------------------------------------------------------
-       1. BACKGROUND & THEME
-    ------------------------------------------------------------------------- */
-    .stApp {{
-        background: {bg_gradient};
-        background-size: 200% 200%;
-        animation: gradientBG 15s ease infinite;
-        background-attachment: fixed;
-    }}
-    
-    @keyframes gradientBG {{
-        0% {{ background-position: 0% 50%; }}
-        50% {{ background-position: 100% 50%; }}
-        100% {{ background-position: 0% 50%; }}
-    }}
-
-    /* -------------------------------------------------------------------------
-       TYPOGRAPHY
-    ------------------------------------------------------------------------- */
-    /* Global Text */
-    html, body, [class*="css"] {{
-        font-family: 'Lato', sans-serif;
-        color: #E0F7FA;
-    }}
-
-    /* Headings */
-    h1 {{
-        font-family: 'Montserrat', sans-serif !important;
-        font-weight: 900 !important;
-        text-transform: uppercase;
-        letter-spacing: 2px;
-        font-size: 3rem !important;
-        background: linear-gradient(120deg, #fff, #87CEFA, #fff);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-shadow: 0px 4px 10px rgba(0,0,0,0.3);
-    }}
-
-    h2 {{
-        font-family: 'Montserrat', sans-serif !important;
-        font-weight: 700 !important;
-        font-size: 2.2rem !important;
-        color: #FFFFFF !important;
-        letter-spacing: 1px;
-        margin-top: 1.5rem !important;
-        margin-bottom: 1rem !important;
-        border-bottom: 2px solid rgba(255,255,255,0.1);
-        padding-bottom: 10px;
-        display: inline-block;
-    }}
-
-    h3 {{
-        font-family: 'Montserrat', sans-serif !important;
-        font-weight: 600 !important;
-        font-size: 1.6rem !important;
-        color: #FFFFFF !important; /* Reverted to White */
-    }}
-    
-    h4 {{
-        font-family: 'Montserrat', sans-serif !important;
-        font-weight: 500 !important;
-        font-size: 1.3rem !important;
-        color: #FFD700 !important; /* Gold */
-    }}
-
-    /* Body Text & Paragraphs */
-    p, div, li {{
-        font-family: 'Lato', sans-serif;
-        font-size: 1.1rem;
-        line-height: 1.6;
-        font-weight: 300;
-        color: #E0F7FA;
-    }}
-
-    /* Highlighted Numbers/Stats */
-    .stat-number {{
-        font-family: 'Montserrat', sans-serif;
-        font-weight: 800;
-        font-size: 2.5rem;
-        color: #FFD700;
-    }}
-
-    /* Quotes */
-    blockquote {{
-        font-family: 'Playfair Display', serif;
-        font-size: 1.3rem !important;
-        font-style: italic;
-        color: #B0C4DE;
-        border-left: 4px solid #87CEFA;
-        padding-left: 20px;
-        margin: 20px 0;
-    }}
-
-    /* Streamlit specific overrides */
-    div[data-testid="stMarkdownContainer"] p {{
-        font-size: 1.1rem;
-    }}
-
-    /* -------------------------------------------------------------------------
-       2. UI COMPONENTS (Frosted Glass)
-    ------------------------------------------------------------------------- */
-    .frosted-card {{
-        background: rgba(255, 255, 255, 0.08);
-        backdrop-filter: blur(16px);
-        -webkit-backdrop-filter: blur(16px);
-        border-radius: 16px;
-        border: 1px solid rgba(255, 255, 255, 0.2);
-        padding: 20px;
-        box-shadow: 0 4px 30px rgba(0, 0, 0, 0.1);
-        margin-bottom: 20px;
-        transition: transform 0.3s ease, box-shadow 0.3s ease;
-    }}
-    
-    .frosted-card:hover {{
-        transform: translateY(-5px);
-        box-shadow: 0 10px 40px rgba(118, 75, 162, 0.3); /* Purple Glow */
-        border-color: rgba(255, 215, 0, 0.4); /* Gold Border Hint */
-    }}
-
-    /* -------------------------------------------------------------------------
-       3. CUSTOM YEAR SELECTOR STYLING
-    ------------------------------------------------------------------------- */
-    div[data-testid="stRadio"] > label {{ display: none; }}
-    div[data-testid="stRadio"] div[role="radiogroup"] {{
-        flex-direction: column;
-        background: rgba(0,0,0,0.2);
-        border-radius: 15px;
-        padding: 10px;
-        border: 1px solid rgba(255,255,255,0.1);
-        z-index: 2;
-        position: relative;
-    }}
-    div[data-testid="stRadio"] label[data-baseweb="radio"] {{
-        background: transparent;
-        margin-bottom: 5px;
-        transition: all 0.3s;
-    }}
-    div[data-testid="stRadio"] label[data-baseweb="radio"]:hover {{
-        background: rgba(255,255,255,0.1);
-        border-radius: 5px;
-        padding-left: 10px;
-    }}
-
-    /* -------------------------------------------------------------------------
-       4. ANIMATIONS & DECORATION
-    ------------------------------------------------------------------------- */
-    @keyframes rotate {{
-        from {{ transform: rotate(0deg); }}
-        to {{ transform: rotate(360deg); }}
-    }}
-    
-    .astrolabe-bg {{
-        position: fixed;
-        top: 100px;
-        left: -100px;
-        width: 500px;
-        height: 500px;
-        background-image: url("https://img.icons8.com/ios/500/ffffff/snowflake.png");
-        background-size: contain;
-        background-repeat: no-repeat;
-        opacity: 0.05;
-        animation: rotate 120s linear infinite;
-        pointer-events: none;
-        z-index: 0;
-    }}
-
-    /* Snowflakes CSS Implementation */
-    .snowflake {{
-        color: #fff;
-        font-size: 1em;
-        font-family: Arial, sans-serif;
-        text-shadow: 0 0 5px #000;
-        position: fixed;
-        top: -10%;
-        z-index: 9999;
-        user-select: none;
-        cursor: default;
-        animation-name: snowflakes-fall, snowflakes-shake;
-        animation-duration: 10s, 3s;
-        animation-timing-function: linear, ease-in-out;
-        animation-iteration-count: infinite, infinite;
-        animation-play-state: running, running;
-        opacity: 0.3;
-    }}
-    @keyframes snowflakes-fall {{
-        0% {{ top: -10%; }}
-        100% {{ top: 100%; }}
-    }}
-    @keyframes snowflakes-shake {{
-        0%, 100% {{ transform: translateX(0); }}
-        50% {{ transform: translateX(80px); }}
-    }}
-    .snowflake:nth-of-type(0) {{ left: 1%; animation-delay: 0s, 0s; }}
-    .snowflake:nth-of-type(1) {{ left: 10%; animation-delay: 1s, 1s; }}
-    .snowflake:nth-of-type(2) {{ left: 20%; animation-delay: 6s, .5s; }}
-    .snowflake:nth-of-type(3) {{ left: 30%; animation-delay: 4s, 2s; }}
-    .snowflake:nth-of-type(4) {{ left: 40%; animation-delay: 2s, 2s; }}
-    .snowflake:nth-of-type(5) {{ left: 50%; animation-delay: 8s, 3s; }}
-    .snowflake:nth-of-type(6) {{ left: 60%; animation-delay: 6s, 2s; }}
-    .snowflake:nth-of-type(7) {{ left: 70%; animation-delay: 2.5s, 1s; }}
-    .snowflake:nth-of-type(8) {{ left: 80%; animation-delay: 1s, 0s; }}
-    .snowflake:nth-of-type(9) {{ left: 90%; animation-delay: 3s, 1.5s; }}
-    .snowflake:nth-of-type(10) {{ left: 25%; animation-delay: 2s, 0s; }}
-    .snowflake:nth-of-type(11) {{ left: 65%; animation-delay: 4s, 2.5s; }}
-</style>
-""", unsafe_allow_html=True)
+# The stylesheet, fonts and snowflake image are local static files (static/theme.css),
+# so nothing is fetched from remote hosts. Each full rerun only sends this one-line
+# @import; the versioned URL lets the browser keep the stylesheet cached.
+st.markdown(f'<style>@import url("{static_url("theme.css")}");</style>', unsafe_allow_html=True)
 
 # Add Snowflakes
 st.markdown("""
@@ -271,197 +57,198 @@ st.markdown("""
 # ==========================================
 # 2. Data Logic
 # ==========================================
-@st.cache_data
 def load_data(file_path):
     try:
-        df = pd.read_csv(file_path)
-        
-        # Basic Cleaning
-        # 1. Clean Discipline names
-        if 'discipline' in df.columns:
-            df['discipline_clean'] = df['discipline'].apply(lambda x: x.split('(')[0].strip() if isinstance(x, str) else x)
-        
-        # 2. Map NOC to Country Names (Simplified)
-        noc_map = {
-            'USA': 'United States', 'CHN': 'China', 'NOR': 'Norway', 'GER': 'Germany', 
-            'AUT': 'Austria', 'CAN': 'Canada', 'ITA': 'Italy', 'FRA': 'France',
-            'SWE': 'Sweden', 'SUI': 'Switzerland', 'NED': 'Netherlands', 'RUS': 'Russia',
-            'FIN': 'Finland', 'JPN': 'Japan', 'KOR': 'South Korea'
-        }
-        df['Country'] = df['noc'].map(noc_map).fillna(df['noc'])
-        
-        # 3. Score for sorting (Gold=3, Silver=2, Bronze=1)
-        medal_score = {'Gold': 3, 'Silver': 2, 'Bronze': 1}
-        df['score'] = df['medal'].map(medal_score).fillna(0)
-        
-        return df
+        # One dataset per process, shared by all sessions. Cleaned, typed columns come
+        # from the memory-mapped columnar copy of the CSV; result files queued in
+        # data_deltas/ are merged in as they arrive, without reloading the history.
+        return get_store(file_path).current()
     except Exception as e:
         st.error(f"Error loading data: {e}")
-        return pd.DataFrame()
+        return None
 
-df = load_data("data.csv")
+DATA_PATH = "data.csv"
 
-if df.empty:
+# Live mode (MILAN2026_LIVE_FEED=<file>): one feed thread per server merges new medals
+# into the shared dataset; see live_watch below for how open pages pick them up
+LIVE_FEED = feed_path()
+live_feed = start_feed(LIVE_FEED, DATA_PATH) if LIVE_FEED else None
+
+with profile.section("load_data"):
+    dataset = load_data(DATA_PATH)
+
+if dataset is None or not len(dataset):
     st.stop()
 
+with profile.section("search_index"):
+    search_index(dataset)  # Built once per dataset version, before anyone types
+
+# Background warm-up of every shared cache; already running when started via serve.py
+warmup = start_warmup(DATA_PATH)
+
+# Changes with data.csv and with every applied delta: invalidates the figure caches
+data_version = dataset.version
+
 # ==========================================
 # 3. Sidebar / Layout
 # ==========================================
 
-col_left, col_center, col_right = st.columns([1, 3, 1.2])
-
-# --- LEFT: SNOWFLAKE ASTROLABE (Navigation) ---
-with col_left:
-    # Removed broken HTML wrappers that caused empty boxes
-    st.markdown("### ❄️ 年份")
-    
-    # Get available years and sort descending
-    years = sorted(df['year'].unique(), reverse=True)
-    
-    selected_year = st.radio(
-        "Select Year",
-        years,
-        index=0,
-        label_visibility="collapsed"
-    )
-    
-    st.markdown("---")
-    st.markdown("### 国家筛选")
-    
-    # Top countries for the filter
-    top_countries = df['Country'].value_counts().head(10).index.tolist()
-    selected_country = st.selectbox("Select Nation", ["All"] + top_countries)
-
-# --- DATA FILTERING ---
-filtered_df = df[df['year'] == selected_year]
-if selected_country != "All":
-    filtered_df = filtered_df[filtered_df['Country'] == selected_country]
-
-# --- CENTER: TREEMAP (The Ice Block) ---
-with col_center:
-    st.markdown(f'<h2 style="text-align: center; text-shadow: 0 0 10px #764ba2;">Winter Olympics {selected_year} Medal Distribution</h2>', unsafe_allow_html=True)
-    
-    # TREEMAP LOGIC
-    # We use the raw data to allow drilling down: Discipline -> Country -> Medal -> Event -> Athlete
-    
-    # Prepare data for Treemap
-    treemap_df = filtered_df.copy()
-    # Rename 'as' column to 'Athlete' if it exists, for better labeling
-    if 'as' in treemap_df.columns:
-        treemap_df = treemap_df.rename(columns={'as': 'Athlete'})
-    else:
-        treemap_df['Athlete'] = 'Unknown'
-        
-    # Fill NaNs for display
-    treemap_df['event'] = treemap_df['event'].fillna('Unknown Event')
-    treemap_df['Athlete'] = treemap_df['Athlete'].fillna('Unknown Athlete')
-    
-    # We want to color by score (Gold=3, Silver=2, Bronze=1)
-    # This naturally makes Gold blocks "warmer/brighter"
-    
-    if selected_country == "All":
-        path_list = [px.Constant("All Events"), 'discipline_clean', 'Country', 'medal', 'event', 'Athlete']
-    else:
-        # If a country is selected, the Country level is redundant. Show Discipline directly.
-        path_list = [px.Constant(selected_country), 'discipline_clean', 'medal', 'event', 'Athlete']
-
-    fig_tree = px.treemap(
-        treemap_df,
-        path=path_list,
-        color='score', 
-        color_continuous_scale=[
-            [0.0, 'rgba(173, 216, 230, 0.5)'], # Light Blue (Ice/Bronze-ish low)
-            [0.5, 'rgba(255, 255, 255, 0.8)'], # White (Silver-ish mid)
-            [1.0, '#FFD700']  # Gold (High)
-        ],
-        hover_data=['event', 'Athlete', 'medal'],
-        maxdepth=3 # Initially show up to Country/Medal level to avoid clutter
-    )
-    
-    fig_tree.update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        margin=dict(t=0, l=0, r=0, b=0),
-        font=dict(color='white', family="Helvetica Neue"),
-        hoverlabel=dict(
-            bgcolor="rgba(11, 16, 38, 0.9)",
-            font_size=14,
-            font_family="Helvetica Neue"
-        ),
-        coloraxis_showscale=False # Hide the color bar for cleaner look
-    )
-    
-    # Add borders
-    fig_tree.update_traces(
-        marker=dict(
-            line=dict(width=1.5, color='rgba(255,255,255,0.7)'),
-            pad=dict(t=2, l=2, r=2, b=2)
-        ),
-        tiling=dict(packing='squarify'),
-        textinfo="label+value"
-    )
-
-    st.plotly_chart(fig_tree, use_container_width=True)
-    
-    # --- BOTTOM: TREND LINE (The Ski Track) ---
-    st.markdown("### 表现趋势")
-    
-    # Logic for "All": Show the trend of the TOP NATION of the CURRENTLY SELECTED YEAR
-    # Logic for Specific Country: Show that country's trend
-    
-    if selected_country == "All":
-        # Find top nation of selected year
-        if not filtered_df.empty:
-            top_nation_year = filtered_df.groupby('Country')['score'].sum().idxmax()
-            trend_nation = top_nation_year
-            title_suffix = f"Top Nation of {selected_year}: {trend_nation}"
-        else:
-            trend_nation = None # Fallback
-            title_suffix = "No Data"
-    else:
-        trend_nation = selected_country
-        title_suffix = trend_nation
-        
-    if trend_nation:
-        # Get historical data for this nation
-        trend_data = df[df['Country'] == trend_nation].groupby('year')['score'].sum().reset_index().sort_values('year')
-        
-        fig_line = px.line(trend_data, x='year', y='score', markers=True)
-        
-        # Make it look like a ski track (Smooth Spline, Glow)
-        fig_line.update_traces(
-            line_shape='spline', 
-            line_color='#00d2ff', 
-            line_width=4,
-            marker=dict(size=10, color='white', line=dict(width=2, color='#00d2ff'))
+# Live updates rerun only the fragments that draw medal data; headers, the sidebar and
+# the China section stay as they are. Those fragments read the shared store themselves
+# (fragment reruns reuse the arguments of the last full run).
+LIVE_FRAGMENTS = ["medal_overview", "medal_race", "program_history"]
+st.session_state["live_version"] = data_version
+
+
+def live_dataset(dataset):
+    # Newest merged dataset, without touching the file system
+    return get_store(DATA_PATH).peek() or dataset
+
+
+# The only polling left: in live mode every open page reruns a small timed fragment to
+# compare the store version in memory (no file or network access). Its rate follows the
+# feed (ResultsFeed.session_poll_s); when that moves, the outer fragment reruns and
+# registers the timer again at the new rate. When the version moved, the LIVE_FRAGMENTS
+# rerun; their figures are cached per dataset version, so each update is built once for
+# all viewers.
+@st.fragment(key="live_watch")
+def live_watch():
+    poll_s = live_feed.session_poll_s()
+
+    @st.fragment(run_every=poll_s)
+    def live_tick():
+        current = get_store(DATA_PATH).peek()
+        updated = time.strftime("%H:%M:%S", time.localtime(live_feed.last_update)) if live_feed.last_update else "—"
+        st.caption(f"🔴 LIVE · {current.medal_count} medals · last update {updated}")
+        stale = ["live_watch"] if live_feed.session_poll_s() != poll_s else []
+        if current.version != st.session_state.get("live_version"):
+            st.session_state["live_version"] = current.version
+            stale += LIVE_FRAGMENTS
+        if stale:
+            rerun_fragments(stale)
+
+    live_tick()
+
+if live_feed is not None:
+    live_watch()
+
+# Year / country controls only rerun this fragment (treemap, trend, top-5, facts);
+# the evolution tree and the China section are left untouched.
+MEDAL_ICONS = {'Gold': '🥇', 'Silver': '🥈', 'Bronze': '🥉'}
+
+def jump_to(year, country):
+    # Search result clicked: point the year / nation filters at it (runs before the widgets are
+    # drawn) and rerun the overview around the search box, not just the box
+    st.session_state["overview_year"] = year
+    st.session_state["overview_country"] = country
+    st.rerun("medal_overview")
+
+# Athlete / event / discipline search over the prebuilt index. Its own fragment: the box
+# commits while typing (live=True), and each keystroke only reruns the box and its hits.
+@st.fragment(key="search_box")
+def search_box(dataset):
+    profile = RunProfile("search_box", st.session_state["perf_history"])
+    dataset = live_dataset(dataset)
+    query = st.text_input("Search", key="overview_search", type="search", live=True,
+                          placeholder="运动员 / 项目 / 大项", label_visibility="collapsed")
+    if query:
+        with profile.section("search"):
+            hits = search_index(dataset).search(query)
+        if not hits:
+            st.caption("没有找到匹配结果")
+        for i, hit in enumerate(hits):
+            label = f"{MEDAL_ICONS.get(hit['medal'], '')} {hit['year']} · {hit['noc']} · {hit['athlete']} — {hit['event']}"
+            st.button(label, key=f"search_hit_{i}", on_click=jump_to, args=(hit['year'], hit['Country']), use_container_width=True)
+
+@st.fragment(key="medal_overview")
+def medal_overview(dataset):
+    profile = RunProfile("medal_overview", st.session_state["perf_history"])
+    dataset = live_dataset(dataset)
+    data_version = dataset.version
+    cube = dataset.cube
+    col_left, col_center, col_right = st.columns([1, 3, 1.2])
+
+    # --- LEFT: SNOWFLAKE ASTROLABE (Navigation) ---
+    with col_left:
+        st.markdown("### 🔍 搜索")
+        search_box(dataset)
+        st.markdown("---")
+
+        # Removed broken HTML wrappers that caused empty boxes
+        st.markdown("### ❄️ 年份")
+
+        # Get available years and sort descending
+        years = sorted(dataset.index.year_spans, reverse=True)
+        countries = country_options(cube)
+        # Filters set by an older dataset / search jump must still be valid options
+        if st.session_state.get("overview_year") not in years:
+            st.session_state.pop("overview_year", None)
+        if st.session_state.get("overview_country") not in countries:
+            st.session_state.pop("overview_country", None)
+
+        selected_year = st.radio(
+            "Select Year",
+            years,
+            key="overview_year",
+            label_visibility="collapsed"
         )
-        
-        # Remove grid, add "Glow" shadow via drop-shadow filter (in CSS usually, but here we simulate with layout)
-        fig_line.update_layout(
-            title=dict(text=f"Medal Score History ({title_suffix})", font=dict(color='white')),
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(255,255,255,0.02)',
-            font=dict(color='white'),
-            xaxis=dict(
-                showgrid=False, 
-                gridcolor='rgba(255,255,255,0.05)',
-                zeroline=False,
-                showline=False
-            ),
-            yaxis=dict(
-                showgrid=False, 
-                gridcolor='rgba(255,255,255,0.05)',
-                zeroline=False,
-                showline=False
-            ),
-            margin=dict(t=40, l=10, r=10, b=10),
-            hovermode="x unified"
-        )
-        
-        st.plotly_chart(fig_line, use_container_width=True)
-        
-        # Add descriptive text below Trend Line
-        st.markdown("""
+
+        st.markdown("---")
+        st.markdown("### 国家筛选")
+
+        # Every nation with a medal, most medals first
+        selected_country = st.selectbox("Select Nation", countries, key="overview_country")
+
+    # --- DATA FILTERING ---
+    with profile.section("filter"):
+        filtered_df = view_rows(dataset, selected_year, selected_country)
+
+    # --- CENTER: TREEMAP (The Ice Block) ---
+    with col_center:
+        st.markdown(f'<h2 style="text-align: center; text-shadow: 0 0 10px #764ba2;">Winter Olympics {selected_year} Medal Distribution</h2>', unsafe_allow_html=True)
+
+        # TREEMAP LOGIC
+        # Only pre-aggregated nodes down to the Medal level are sent to the browser.
+        # Clicking a discipline / country / medal block fetches its Event -> Athlete
+        # breakdown from the server and renders it underneath.
+        # Treemap / trend / top-5 figures for this filter come from a shared LRU cache.
+        with profile.section("overview_figures", cache=FIGURE_CACHE):
+            overview = overview_figures(data_version, filtered_df, cube, selected_year, selected_country)
+        tree_nodes = overview.tree_nodes
+
+        with profile.section("treemap") as sec:
+            tree_selection = st.plotly_chart(
+                overview.tree, use_container_width=True, on_select="rerun", selection_mode="points",
+                key=f"treemap_{selected_year}_{selected_country}"
+            )
+            sec.add_figure(overview.tree)
+
+        # --- DRILL-DOWN (lazy) ---
+        tree_points = tree_selection.selection.points if tree_selection and tree_selection.selection else []
+        if tree_points:
+            drill_id = full_id(tree_nodes['id'], tree_points[0].get("id") or "")
+            levels = treemap_levels(selected_country)
+            drill_df, drill_levels = drilldown_rows(treemap_rows(filtered_df), tree_nodes, drill_id, levels)
+            if drill_df is not None and not drill_df.empty:
+                drill_label = drill_id.split("/", 1)[-1].replace("/", " · ")
+                st.markdown(f"#### 🔍 {drill_label}")
+                with profile.section("treemap_drilldown") as sec:
+                    fig_drill = compact_figure(build_treemap(treemap_nodes(drill_df, drill_levels, drill_label)))
+                    st.plotly_chart(fig_drill, use_container_width=True)
+                    sec.add_figure(fig_drill)
+
+        # --- BOTTOM: TREND LINE (The Ski Track) ---
+        st.markdown("### 表现趋势")
+
+        # Logic for "All": Show the trend of the TOP NATION of the CURRENTLY SELECTED YEAR
+        # Logic for Specific Country: Show that country's trend
+        if overview.trend is not None:
+            with profile.section("trend") as sec:
+                st.plotly_chart(overview.trend, use_container_width=True)
+                sec.add_figure(overview.trend)
+
+            # Add descriptive text below Trend Line
+            st.markdown("""
         <div style="background: rgba(255, 255, 255, 0.05); border-radius: 10px; padding: 15px; margin-top: 10px; border-left: 4px solid #FFD700;">
             <h4 style="color: #FFD700; margin: 0 0 10px 0;">百年冰雪：从“北欧后花园”到全球竞技场</h4>
             <p style="color: #ddd; font-size: 0.9em; margin-bottom: 8px;">
@@ -479,42 +266,37 @@ with col_center:
         </div>
         """, unsafe_allow_html=True)
 
-    else:
-        st.info("No data available for trend analysis.")
-
-# --- RIGHT: INFO & PORTAL ---
-with col_right:
-    # 1. Top Performing Nations
-    st.markdown("### 表现前五位")
-    
-    medal_counts = filtered_df.groupby('Country')['score'].sum().sort_values(ascending=False).head(5)
-    
-    fig_bar = px.bar(
-        x=medal_counts.values,
-        y=medal_counts.index,
-        orientation='h',
-        text=medal_counts.values
-    )
-    fig_bar.update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='white'),
-        margin=dict(t=0, l=0, r=50, b=0), # Increased right margin for labels
-        xaxis=dict(visible=False),
-        yaxis=dict(autorange="reversed"),
-        height=200,
-        barcornerradius=5
-    )
-    fig_bar.update_traces(
-        marker_color='rgba(255, 215, 0, 0.8)', # Soft Gold
-        textposition='outside',
-        cliponaxis=False, # Allow text to extend beyond axis
-        marker_line_width=0
-    )
-    st.plotly_chart(fig_bar, use_container_width=True, config={'displayModeBar': False})
-
-    # 2. Milan 2026 Portal (Visual Only)
-    st.markdown(f"""
+        else:
+            st.info("No data available for trend analysis.")
+
+        # Overlay several nations (5-10 at a time): each one is a column of the year x nation matrix
+        st.markdown("#### 多国对比")
+        cmp_col1, cmp_col2 = st.columns([3, 1])
+        compare_countries = cmp_col1.multiselect(
+            "Compare nations", countries[1:], key="overview_compare", max_selections=10,
+            placeholder="选择要对比的国家", label_visibility="collapsed"
+        )
+        compare_metric = cmp_col2.selectbox(
+            "Metric", list(COMPARE_METRICS), format_func=COMPARE_METRICS.get,
+            key="overview_compare_metric", label_visibility="collapsed"
+        )
+        if compare_countries:
+            with profile.section("compare", cache=FIGURE_CACHE) as sec:
+                fig_compare = comparison_figure(data_version, cube, compare_countries, compare_metric)
+                st.plotly_chart(fig_compare, use_container_width=True)
+                sec.add_figure(fig_compare)
+
+    # --- RIGHT: INFO & PORTAL ---
+    with col_right:
+        # 1. Top Performing Nations
+        st.markdown("### 表现前五位")
+
+        with profile.section("top5") as sec:
+            st.plotly_chart(overview.bar, use_container_width=True, config={'displayModeBar': False})
+            sec.add_figure(overview.bar)
+
+        # 2. Milan 2026 Portal (Visual Only)
+        st.markdown(f"""
     <div class="frosted-card floating-element" style="
         border: 2px solid rgba(163, 108, 253, 0.6); 
         background: linear-gradient(135deg, rgba(163, 108, 253, 0.2) 0%, rgba(0, 210, 255, 0.2) 100%);
@@ -525,15 +307,37 @@ with col_right:
         <p style="font-size: 0.8em; opacity: 0.7;">February 6 - 22, 2026</p>
     </div>
     """, unsafe_allow_html=True)
-    
-    # 3. Facts / Carousel
-    if not filtered_df.empty:
-        st.markdown("#### 你知道吗？")
-        try:
-            fact = filtered_df.sample(1).iloc[0]
-            st.info(f"In {selected_year}, {fact['as']} from {fact['Country']} took home {fact['medal']} in {fact['discipline_clean']}!")
-        except:
-            st.write("没有更多数据了！")
+
+        # 3. Facts / Carousel
+        if not filtered_df.empty:
+            st.markdown("#### 你知道吗？")
+            try:
+                fact = filtered_df.sample(1).iloc[0]
+                st.info(f"In {selected_year}, {fact['as']} from {fact['Country']} took home {fact['medal']} in {fact['discipline_clean']}!")
+            except:
+                st.write("没有更多数据了！")
+
+medal_overview(dataset)
+
+# --- SECTION: MEDAL TABLE RACE (Animated) ---
+st.markdown("---")
+st.markdown("### 🏁 奖牌榜百年竞速 (Medal Table Race)")
+
+# Switching the ranking only reruns this fragment; both animations are precomputed
+# from the cube's rank matrix and cached per dataset version
+@st.fragment(key="medal_race")
+def medal_race(dataset):
+    profile = RunProfile("medal_race", st.session_state["perf_history"])
+    dataset = live_dataset(dataset)
+    cube, data_version = dataset.cube, dataset.version
+    order = st.radio("Ranking", list(RACE_ORDERS), format_func=RACE_ORDERS.get, horizontal=True,
+                     key="race_order", label_visibility="collapsed")
+    with profile.section("medal_race", cache=FIGURE_CACHE) as sec:
+        fig_race = medal_race_figure(data_version, cube, order)
+        st.plotly_chart(fig_race, use_container_width=True)
+        sec.add_figure(fig_race)
+
+medal_race(dataset)
 
 # --- SECTION: PROJECT EVOLUTION (Tree Chart) ---
 st.markdown("---")
@@ -567,130 +371,58 @@ with col_evo_text:
 </div>
 """, unsafe_allow_html=True)
 
-with col_evo_chart:
-    st.subheader(f"📊 冬奥项目百年变迁 (Olympic Program History)")
-    
-    # Data Prep for ECharts Tree
-    # We want to show: Root -> Discipline -> Events
-    # For each event, we show when it started and ended.
-    
-    if 'event' in df.columns and 'discipline_clean' in df.columns:
-        # 1. Aggregate Event History
-        # Group by Discipline, Event -> Get Min Year, Max Year
-        event_history = df.groupby(['discipline_clean', 'event'])['year'].agg(['min', 'max']).reset_index()
-        
-        # Structure for ECharts Tree
-        # {
-        #   name: "Winter Games",
-        #   children: [
-        #       {
-        #           name: "Skiing",
-        #           children: [
-        #               { name: "Alpine Skiing (1936-Present)", value: "1936-2026" }
-        #           ]
-        #       }
-        #   ]
-        # }
-        
-        tree_data = {"name": "❄️ Winter Olympics", "children": []}
-        
-        # Get all disciplines
-        disciplines = sorted(event_history['discipline_clean'].unique())
-        
-        for disc in disciplines:
-            disc_node = {"name": disc, "children": []}
-            
-            # Get events for this discipline
-            disc_events = event_history[event_history['discipline_clean'] == disc]
-            
-            for _, row in disc_events.iterrows():
-                evt_name = row['event']
-                start_year = row['min']
-                end_year = row['max']
-                latest_year = max(years) # Assuming 'years' list exists and is sorted desc
-                
-                # Determine status
-                is_active = (end_year == latest_year)
-                
-                # Format label
-                if is_active:
-                    time_str = f"{start_year} - Present"
-                    # Highlight New Events (e.g. started in last 2 cycles)
-                    if start_year >= latest_year - 4: 
-                        label = f"✨ {evt_name}"
-                        item_style = {"color": "#00FF7F"} # New Green
-                    else:
-                        label = evt_name
-                        item_style = {"color": "#87CEFA"} # Active Blue
-                else:
-                    time_str = f"{start_year} - {end_year}"
-                    label = f"❌ {evt_name}"
-                    item_style = {"color": "#FF6347"} # Discontinued Red
-                
-                # Add node
-                # We add time_str to name or tooltip? 
-                # Tree chart shows 'name'.
-                disc_node["children"].append({
-                    "name": label,
-                    "value": time_str, # Tooltip value
-                    "itemStyle": item_style,
-                    "label": {"color": "#fff" if is_active else "#aaa"}
-                })
-                
-            tree_data["children"].append(disc_node)
-
-        # ECharts Options
-        option = {
-            "tooltip": {
-                "trigger": "item",
-                "triggerOn": "mousemove",
-                "formatter": "{b}: {c}"
-            },
-            "series": [
-                {
-                    "type": "tree",
-                    "data": [tree_data],
-                    "top": "5%",
-                    "left": "15%",
-                    "bottom": "5%",
-                    "right": "20%",
-                    "symbolSize": 7,
-                    "label": {
-                        "position": "left",
-                        "verticalAlign": "middle",
-                        "align": "right",
-                        "fontSize": 14,
-                        "color": "#fff"
-                    },
-                    "leaves": {
-                        "label": {
-                            "position": "right",
-                            "verticalAlign": "middle",
-                            "align": "left"
-                        }
-                    },
-                    "emphasis": {
-                        "focus": "descendant"
-                    },
-                    "expandAndCollapse": True,
-                    "animationDuration": 550,
-                    "animationDurationUpdate": 750,
-                    "initialTreeDepth": 1, # Only show Discipline level initially
-                    "lineStyle": {
-                        "color": "rgba(255,255,255,0.5)",
-                        "curveness": 0.5
-                    }
-                }
-            ]
-        }
-        
+# Only the discipline level goes to the browser first; clicking a discipline sends its
+# name back and this fragment reruns with that discipline's events filled in (event
+# nodes are cached server-side per dataset version)
+TREE_CLICK_JS = """
+function (params) {
+    if (params.data && params.data.kind === "discipline") {
+        return {discipline: params.name, at: Date.now()};
+    }
+}
+"""
+
+
+def tree_click(result):
+    # Discipline click from st_echarts: the handler's return value (newer streamlit-echarts
+    # versions hand it back as chart_event)
+    event = getattr(result, "chart_event", None) or result
+    if isinstance(event, dict) and event.get("discipline"):
+        return event
+    return None
+
+
+@st.fragment(key="program_history")
+def program_history(dataset):
+    profile = RunProfile("program_history", st.session_state["perf_history"])
+    dataset = live_dataset(dataset)
+    data_version = dataset.version
+    expanded = st.session_state.setdefault("evolution_open", frozenset())
+    with profile.section("evolution_tree", cache=PROGRAM_TREE_CACHE) as sec:
+        tree_json = program_tree_json(data_version, dataset.events, dataset.latest_year, expanded)
+        option = json.loads(tree_json)
+        sec.add_bytes(len(tree_json.encode()))
+
         # Render
         try:
             from streamlit_echarts import st_echarts
-            st_echarts(options=option, height="800px")
+            result = st_echarts(options=option, events={"click": TREE_CLICK_JS}, height="800px", key="evolution_tree")
         except ImportError:
             st.error("Please install streamlit-echarts to view this chart.")
+            return
 
+    # The component keeps returning the last click: act on each click once
+    click = tree_click(result)
+    if click is not None and click.get("at") != st.session_state.get("evolution_click"):
+        st.session_state["evolution_click"] = click.get("at")
+        st.session_state["evolution_open"] = expanded ^ {click["discipline"]}
+        st.rerun(scope="fragment")
+
+with col_evo_chart:
+    st.subheader(f"📊 冬奥项目百年变迁 (Olympic Program History)")
+
+    if 'event' in dataset.medals.columns and 'discipline_clean' in dataset.medals.columns:
+        program_history(dataset)
     else:
         st.warning("Data missing necessary columns for Project Evolution.")
 
@@ -706,97 +438,54 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # 1. Load Data for China Prediction from CSV
+@st.cache_resource(max_entries=2)
+def load_china_forecast(file_path, version):
+    # Parsed and shaped into the Sport -> Athlete hierarchy once per file version;
+    # one read-only instance shared by all sessions (cache_data would unpickle a copy per rerun)
+    return read_china_forecast(file_path)
+
+CHINA_PATH = "china_data.csv"
 try:
-    china_df = pd.read_csv('china_data.csv')
-    china_df = china_df.fillna("")
+    # Analysts edit this file during the Games: a new mtime/size rebuilds the model
+    china_version = file_signature(CHINA_PATH)
+    with profile.section("load_china"):
+        china = load_china_forecast(CHINA_PATH, china_version)
 except Exception as e:
     st.error(f"Error loading china_data.csv: {e}")
-    china_df = pd.DataFrame()
-
-if not china_df.empty:
-    # --- DATA PROCESSING FOR HIERARCHY ---
-    # 1. Group by Sport to get total medals for the parent node
-    sport_group = china_df.groupby(['sport', 'icon'])['medals'].sum().reset_index()
-    sport_group['label'] = sport_group['sport']
-    sport_group['id'] = sport_group['sport'] + " " + sport_group['icon']
-    sport_group['parent'] = "" # Root nodes
-    
-    # 2. Create Athlete nodes (Children)
-    china_df['parent'] = china_df['sport'] + " " + china_df['icon']
-    china_df['label'] = china_df['athlete']
-    china_df['id'] = china_df['parent'] + " - " + china_df['athlete'] # Unique ID
-    
-    # 3. Combine for Sunburst
-    # Sunburst needs: id, label, parent, value
-    # Parent nodes (Sports)
-    df_parents = sport_group[['id', 'label', 'parent', 'medals', 'sport', 'icon']].copy()
-    df_parents['athlete'] = ""
-    df_parents['desc'] = ""
-    df_parents['img'] = ""
-    
-    # Child nodes (Athletes)
-    df_children = china_df[['id', 'label', 'parent', 'medals', 'sport', 'icon', 'athlete', 'desc', 'img']].copy()
-    
-    # Combine
-    sunburst_df = pd.concat([df_parents, df_children], axis=0)
-
-    unique_sports = sunburst_df['sport'].dropna().unique().tolist()
-    base_colors = [
-        "#FFB3B3",
-        "#FFD6A5",
-        "#FFF59D",
-        "#C8E6C9",
-        "#BBDEFB",
-        "#D1C4E9",
-        "#F8BBD0",
-        "#B2EBF2",
-    ]
-    sport_color_map = {sport: base_colors[i % len(base_colors)] for i, sport in enumerate(unique_sports)}
+    china = None
+
+# Clicking the sunburst only reruns this fragment (chart + prediction card);
+# the sunburst figure itself comes from the figure cache.
+@st.fragment
+def china_prediction(china, china_version, forecast):
+    profile = RunProfile("china_prediction", st.session_state["perf_history"])
+    china_df = china.athletes
 
     # Layout: Left (Chart) - Right (Card)
     c_col1, c_col2 = st.columns([1.5, 1])
 
     with c_col1:
         # Sunburst Chart with Hierarchy: Sport -> Athlete
-        # "3D Layered" effect simulated with colors and borders
-        fig_sun = px.sunburst(
-            sunburst_df,
-            ids='id',
-            names='label',
-            parents='parent',
-            values='medals',
-            color='sport',
-            color_discrete_map=sport_color_map,
-            hover_data=['sport', 'medals']
-        )
-        
-        fig_sun.update_layout(
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            margin=dict(t=10, l=10, r=10, b=10), # Compact
-            font=dict(color='#263238', family="Microsoft YaHei, Noto Sans SC, PingFang SC, sans-serif", size=13),
-            uniformtext=dict(minsize=10, mode="hide"),
-        )
-        
-        fig_sun.update_traces(
-            textinfo="label+value",
-            insidetextorientation='radial',
-            marker=dict(
-                line=dict(color='rgba(255,255,255,0.85)', width=2), # Strong borders for "Ice Block" look
-            ),
-            textfont=dict(
-                family="Microsoft YaHei, Noto Sans SC, PingFang SC, sans-serif",
-                size=12,
-                color="#263238",
-            ),
-            leaf=dict(opacity=0.95)
-        )
-        
-        # Enable click selection
-        selection = st.plotly_chart(fig_sun, use_container_width=True, on_select="rerun", selection_mode="points")
+        with profile.section("sunburst", cache=FIGURE_CACHE) as sec:
+            fig_sun = sunburst_figure(china_version, china)
+
+            # Enable click selection
+            selection = st.plotly_chart(fig_sun, use_container_width=True, on_select="rerun", selection_mode="points")
+            sec.add_figure(fig_sun)
         
+        # Team forecast from the Monte Carlo projection (medians, 80% interval in the note)
+        china_summary = forecast.summary("China") if forecast is not None else None
+        if china_summary is not None:
+            g, s, b = (int(china_summary.loc[m, 'median']) for m in ['Gold', 'Silver', 'Bronze'])
+            forecast_line = f"预测本届冬奥会中国代表团将取得 {g} 金 {s} 银 {b} 铜的战绩，将有望创造境外参赛最佳战绩！"
+            forecast_note = (f"基于历届数据的 {len(forecast.sims):,} 次蒙特卡洛模拟；80% 区间：金牌 "
+                             f"{int(china_summary.loc['Gold', 'low'])}–{int(china_summary.loc['Gold', 'high'])} 枚，奖牌总数 "
+                             f"{int(china_summary.loc['Total', 'low'])}–{int(china_summary.loc['Total', 'high'])} 枚")
+        else:
+            forecast_line, forecast_note = "中国代表团有望创造境外参赛最佳战绩！", ""
+
         # Add descriptive text below Sunburst Chart (Left Column)
-        st.markdown("""
+        st.markdown(f"""
         <div style="background: rgba(0, 0, 0, 0.2); border-radius: 10px; padding: 15px; margin-top: 10px; border-left: 4px solid #FF4500;">
             <p style="color: #ddd; font-size: 0.9em; margin-bottom: 8px;">
                 预计将有来自全球约 2900 名运动员参赛，在 8 个大项、16 个分项中展开角逐，最终将产生 116 枚金牌。
@@ -804,7 +493,8 @@ if not china_df.empty:
             <p style="color: #ddd; font-size: 0.9em; margin-bottom: 0;">
                 中国代表团将参与 <b>自由式滑雪、单板滑雪、短道速滑、速度滑冰、钢架雪车</b> 等项目，将在传统项目短道速滑、速度滑冰、自由式滑雪等项目上冲击奖牌甚至金牌。
                 <br><br>
-                <span style="color: #FFD700; font-weight: bold;">预测本届冬奥会中国代表团将取得 6 金 5 银 7 铜的战绩，将有望创造境外参赛最佳战绩！</span>
+                <span style="color: #FFD700; font-weight: bold;">{forecast_line}</span>
+                <br><span style="color: #aaa; font-size: 0.85em;">{forecast_note}</span>
             </p>
         </div>
         """, unsafe_allow_html=True)
@@ -817,11 +507,7 @@ if not china_df.empty:
 
     # Default view (first sport)
     if not china_df.empty:
-        default_sport = china_df.iloc[0]['sport']
-        selected_athletes = china_df[china_df['sport'] == default_sport].to_dict('records')
-        selected_sport_name = default_sport
-        selected_sport_icon = china_df.iloc[0]['icon']
-        selected_total_medals = sum(a['medals'] for a in selected_athletes)
+        selected_sport_name, selected_sport_icon, selected_athletes, selected_total_medals = china.default_view()
 
     # Handle Selection
     if selection:
@@ -836,27 +522,13 @@ if not china_df.empty:
                     points = selection.get("points", []) or []
             if points:
                 point = points[0]
-                clicked_label = point.get("label") or point.get("id") or ""
-                if clicked_label:
-                    sport_match = china_df[china_df['sport'] == clicked_label]
-                    if sport_match.empty:
-                        sport_match = china_df[china_df['sport'].apply(lambda x: x in clicked_label)]
-                    if not sport_match.empty:
-                        selected_sport_name = sport_match.iloc[0]['sport']
-                        selected_sport_icon = sport_match.iloc[0]['icon']
-                        selected_athletes = china_df[china_df['sport'] == selected_sport_name].to_dict('records')
-                        selected_total_medals = sum(a['medals'] for a in selected_athletes)
-                    else:
-                        athlete_match = china_df[china_df['athlete'] == clicked_label]
-                        if not athlete_match.empty:
-                            selected_athletes = athlete_match.to_dict('records')
-                            selected_sport_name = selected_athletes[0]['sport']
-                            selected_sport_icon = selected_athletes[0]['icon']
-                            selected_total_medals = selected_athletes[0]['medals']
+                view = china.resolve(full_id(china.sunburst_df['id'], point.get("id") or ""), point.get("label") or "")
+                if view is not None:
+                    selected_sport_name, selected_sport_icon, selected_athletes, selected_total_medals = view
         except Exception:
             pass
 
-    with c_col2:
+    with c_col2, profile.section("china_cards") as sec:
         # --- RENDER CARD (Fixing HTML Indentation Bug) ---
         # We build the HTML string carefully to avoid indentation issues in st.markdown
         
@@ -871,26 +543,8 @@ if not china_df.empty:
 
         # List of Athletes
         for athlete in selected_athletes:
-            # Prepare Image HTML (Local file support)
-            img_src = ""
-            if athlete.get('img'):
-                img_path = athlete['img']
-                if img_path.startswith("http"):
-                    img_src = img_path
-                else:
-                    # Handle local file
-                    try:
-                        # Check if file exists relative to cwd
-                        if os.path.exists(img_path):
-                            with open(img_path, "rb") as f:
-                                b64_data = base64.b64encode(f.read()).decode()
-                                # Detect mime type roughly
-                                mime = "image/jpeg"
-                                if img_path.lower().endswith(".png"):
-                                    mime = "image/png"
-                                img_src = f"data:{mime};base64,{b64_data}"
-                    except:
-                        pass
+            # Avatar: content-hashed 160px thumbnail served as a static file (browser-cacheable)
+            img_src = avatar_url(athlete.get('img'))
             
             if img_src:
                 img_content = f'<img src="{img_src}" style="width: 100%; height: 100%; object-fit: cover;">'
@@ -911,10 +565,45 @@ if not china_df.empty:
 </div>
 """
             st.markdown(athlete_html, unsafe_allow_html=True)
+            sec.add_bytes(len(athlete_html.encode()))
 
         # Footer
         st.markdown("</div>", unsafe_allow_html=True)
 
+# Medal projection for every nation: simulated off the request path (warm-up or a
+# background thread) once per completed-Games history; the page only reads it
+with profile.section("projection"):
+    try:
+        forecast = ready_projection(dataset.cube)
+    except Exception as e:
+        st.warning(f"Projection unavailable: {e}")
+        forecast = None
+
+if china is not None and not china.empty:
+    china_prediction(china, china_version, forecast)
+
+# --- PROJECTION EXPLORER ---
+@st.fragment
+def projection_panel(forecast):
+    with st.expander("📈 2026 奖牌预测 · 各国蒙特卡洛模拟 (Medal Projection)"):
+        table = forecast.table()
+        p_col1, p_col2 = st.columns([1, 1.4])
+        with p_col1:
+            nations = table.index.tolist()
+            nation = st.selectbox("Nation", nations, index=nations.index("China") if "China" in nations else 0,
+                                  key="projection_country")
+            st.dataframe(forecast.summary(nation).round(1), use_container_width=True)
+            st.caption(f"{len(forecast.sims):,} 次模拟 · 中位数与 80% 区间")
+        with p_col2:
+            dist = forecast.distribution(nation)
+            st.bar_chart(pd.DataFrame({'概率': dist.values}, index=dist.index.rename('奖牌总数')))
+        st.dataframe(table.head(15).round(1), use_container_width=True)
+
+if forecast is not None:
+    projection_panel(forecast)
+else:
+    st.caption("📈 奖牌预测正在后台计算，稍后刷新页面即可查看。")
+
 # --- CONCLUSION ---
 st.markdown("---")
 st.markdown("""
@@ -926,3 +615,26 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+# --- DEBUG PANEL (opt-in: ?debug=1) ---
+# Refreshes on its own so fragment reruns show up without a full page run
+@st.fragment(run_every=2)
+def debug_panel():
+    history = list(st.session_state["perf_history"])
+    with st.expander("⏱️ Render timings (debug)", expanded=True):
+        if history:
+            timings = pd.DataFrame(history)
+            latest = timings.groupby(['scope', 'section'], sort=False).tail(1)
+            st.dataframe(latest[['scope', 'section', 'ms', 'bytes', 'cache']], hide_index=True, use_container_width=True)
+            st.caption("p50 / p95 ms per section over the last runs")
+            st.dataframe(
+                timings.groupby(['scope', 'section'], sort=False)['ms'].describe(percentiles=[0.5, 0.95])[['count', '50%', '95%']],
+                use_container_width=True
+            )
+        st.json({
+            'warmup': warmup.progress(),
+            'figure_cache': FIGURE_CACHE.stats(),
+            'program_tree_cache': PROGRAM_TREE_CACHE.stats(),
+        })
+
+if DEBUG:
+    debug_panel()
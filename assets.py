@@ -0,0 +1,151 @@
+import hashlib
+import os
+import shutil
+import threading
+
+# ==========================================
+# Static asset pipeline
+# ==========================================
+# Files under static/ are served by Streamlit at app/static/... (see
+# .streamlit/config.toml). Derived assets are named by content hash, so a URL
+# never changes meaning and browsers can keep them cached: serve.py adds
+# StaticCacheHeaders, which marks those (and the bundled fonts) immutable.
+#
+#   python assets.py [china_data.csv]    -> prebuild all avatar thumbnails
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Without Pillow, avatars are served at their original size
+    Image = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_URL = "app/static"
+
+# Cards show avatars at 80x80 CSS px; 2x keeps them sharp on HiDPI screens
+AVATAR_DISPLAY_SIZE = 80
+AVATAR_SIZE = AVATAR_DISPLAY_SIZE * 2
+AVATAR_DIR = "avatars"
+
+# Cache-Control for app/static: files whose URL changes with their content are
+# kept for good, anything else (e.g. snowflake.svg, referenced by theme.css) is
+# revalidated after an hour
+STATIC_CACHE_IMMUTABLE = b"public, max-age=31536000, immutable"
+STATIC_CACHE_DEFAULT = b"public, max-age=3600"
+IMMUTABLE_DIRS = (AVATAR_DIR + "/", "fonts/")  # Content-hash names / a new name per font version
+
+_avatar_urls = {}
+_avatar_lock = threading.Lock()
+_static_urls = {}
+
+
+def _content_hash(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def _build_avatar(src_path, size):
+    # Write the thumbnail (or a hashed copy without Pillow) and return its file name
+    digest = _content_hash(src_path)
+    out_dir = os.path.join(STATIC_DIR, AVATAR_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+
+    if Image is None:
+        name = digest + os.path.splitext(src_path)[1].lower()
+        out_path = os.path.join(out_dir, name)
+        if not os.path.exists(out_path):
+            shutil.copyfile(src_path, out_path)
+        return name
+
+    name = f"{digest}_{size}.webp"
+    out_path = os.path.join(out_dir, name)
+    if not os.path.exists(out_path):
+        with Image.open(src_path) as img:
+            img = ImageOps.exif_transpose(img).convert("RGBA")
+            # Center-crop to a square, like object-fit: cover in the card
+            thumb = ImageOps.fit(img, (size, size), Image.LANCZOS)
+            tmp_path = out_path + ".tmp"
+            thumb.save(tmp_path, "WEBP", quality=85, method=6)
+        os.replace(tmp_path, out_path)
+    return name
+
+
+def static_url(name):
+    # URL of a file shipped in static/, versioned by content so it can be cached for good
+    path = os.path.join(STATIC_DIR, name)
+    st = os.stat(path)
+    key = (name, st.st_mtime_ns, st.st_size)
+    url = _static_urls.get(key)
+    if url is None:
+        url = f"{STATIC_URL}/{name}?v={_content_hash(path)}"
+        _static_urls[key] = url
+    return url
+
+
+def avatar_url(img_path, size=AVATAR_SIZE):
+    # Cacheable static URL for an athlete avatar ("" if the file is missing)
+    if not img_path:
+        return ""
+    if img_path.startswith("http"):
+        return img_path
+    try:
+        st = os.stat(img_path)
+    except OSError:
+        return ""
+
+    key = (img_path, st.st_mtime_ns, st.st_size, size)
+    url = _avatar_urls.get(key)
+    if url is None:
+        with _avatar_lock:
+            url = _avatar_urls.get(key)
+            if url is None:
+                try:
+                    name = _build_avatar(img_path, size)
+                except OSError:
+                    return ""
+                url = f"{STATIC_URL}/{AVATAR_DIR}/{name}"
+                _avatar_urls[key] = url
+    return url
+
+
+def static_cache_control(name, query_string):
+    # Cache-Control value for app/static/<name>?<query_string>
+    versioned = any(part.startswith(b"v=") for part in query_string.split(b"&"))
+    if versioned or name.startswith(IMMUTABLE_DIRS):
+        return STATIC_CACHE_IMMUTABLE
+    return STATIC_CACHE_DEFAULT
+
+
+class StaticCacheHeaders:
+    # ASGI middleware: Streamlit's static file route only sends an ETag, so set
+    # Cache-Control on its successful responses here (any baseUrlPath)
+
+    def __init__(self, app):
+        self.app = app
+        self.marker = f"/{STATIC_URL}/"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.marker not in scope["path"]:
+            await self.app(scope, receive, send)
+            return
+        value = static_cache_control(scope["path"].partition(self.marker)[2], scope["query_string"])
+
+        async def send_with_cache(message):
+            if message["type"] == "http.response.start" and message["status"] in (200, 304):
+                headers = [(k, v) for k, v in message.get("headers", []) if k.lower() != b"cache-control"]
+                message = {**message, "headers": headers + [(b"cache-control", value)]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cache)
+
+
+if __name__ == "__main__":
+    import sys
+
+    import pandas as pd
+
+    src = sys.argv[1] if len(sys.argv) > 1 else "china_data.csv"
+    for img in pd.read_csv(src)['img'].dropna().unique():
+        print(img, "->", avatar_url(img) or "(missing)")
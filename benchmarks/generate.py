@@ -0,0 +1,70 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# Synthetic scaled medal datasets
+# ==========================================
+# Grows data.csv by an integer factor while keeping its schema
+# (year, type, discipline, event, as, athlete_id, noc, medal).
+# Replica 0 is the real data; every other replica is a perturbed copy:
+#   - new athletes (ids shifted past the real range, names suffixed)
+#   - event variants, so the number of distinct events grows ~ sqrt(scale)
+#   - a share of rows moved to synthetic NOCs, so the nation list grows too
+# Years, disciplines and medal colors keep their real distribution.
+#
+#   python benchmarks/generate.py --scale 10 100 1000
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASE_PATH = os.path.join(ROOT, "data.csv")
+OUT_DIR = os.path.join(ROOT, "benchmarks", "data")
+
+SYNTHETIC_NOCS = 200
+MOVED_SHARE = 0.3
+
+
+def scaled_path(scale):
+    return os.path.join(OUT_DIR, f"data_x{scale}.csv")
+
+
+def scale_dataset(base, scale, seed=2026):
+    rng = np.random.default_rng(seed)
+    n = len(base)
+    out = base.iloc[np.tile(np.arange(n), scale)].reset_index(drop=True)
+    replica = np.repeat(np.arange(scale), n)
+    synthetic = replica > 0
+    suffix = pd.Series(replica.astype(str), index=out.index)
+
+    # New athletes per replica
+    out['athlete_id'] = out['athlete_id'] + replica * (int(base['athlete_id'].max()) + 1)
+    out['as'] = out['as'].where(~synthetic, out['as'] + " #" + suffix)
+
+    # Event variants
+    variants = max(1, int(np.sqrt(scale)))
+    variant = pd.Series((replica % variants).astype(str), index=out.index)
+    out['event'] = out['event'].where(~synthetic | (replica % variants == 0), out['event'] + " " + variant)
+
+    # Synthetic nations
+    moved = synthetic & (rng.random(len(out)) < MOVED_SHARE)
+    codes = np.array([f"X{i:02d}" for i in range(SYNTHETIC_NOCS)])
+    out.loc[moved, 'noc'] = codes[rng.integers(0, SYNTHETIC_NOCS, int(moved.sum()))]
+    return out
+
+
+def generate(scale, base_path=BASE_PATH, seed=2026):
+    path = scaled_path(scale)
+    os.makedirs(OUT_DIR, exist_ok=True)
+    base = pd.read_csv(base_path)
+    scale_dataset(base, scale, seed=seed).to_csv(path, index=False)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate scaled copies of data.csv")
+    parser.add_argument("--scale", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--seed", type=int, default=2026)
+    args = parser.parse_args()
+    for scale in args.scale:
+        print(f"x{scale}: {generate(scale, seed=args.seed)}")
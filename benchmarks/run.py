@@ -0,0 +1,169 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import zlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.generate import generate, scaled_path  # noqa: E402
+from china_forecast import read_china_forecast  # noqa: E402
+from figures import (  # noqa: E402
+    SUMMARY_LEVELS, build_medal_race, build_sunburst, build_top5, build_treemap, build_trend,
+    program_tree, program_tree_children, program_tree_level, program_tree_option, top5_scores,
+    treemap_levels, treemap_nodes, treemap_root, treemap_rows, trend_target,
+)
+from olympic_data import MedalCube, MedalDataset, columnar_path, event_history, event_medals, load_medals  # noqa: E402
+from perf import payload_sizes  # noqa: E402
+
+# ==========================================
+# Dashboard benchmark
+# ==========================================
+# Times the data and figure pipeline behind app.py on data.csv scaled up by
+# benchmarks/generate.py, and records the serialized size of every figure
+# (plain JSON, compact format, compact + deflate).
+# Results go to benchmarks/results/bench-<timestamp>.json for comparison.
+#
+#   python benchmarks/run.py --scale 1 10 100 --repeat 5
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+
+def timed(fn, repeat):
+    # (result of the last call, {min, median} wall seconds)
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        runs.append(time.perf_counter() - start)
+    return result, {'min': min(runs), 'median': statistics.median(runs)}
+
+
+def bench_scale(scale, repeat, country=None):
+    path = scaled_path(scale)
+    if not os.path.exists(path):
+        generate(scale)
+
+    timings, payload = {}, {}
+
+    # --- Loading ---
+    def cold_load():
+        if os.path.exists(columnar_path(path)):
+            os.remove(columnar_path(path))
+        return load_medals(path)
+
+    _, timings['load_cold'] = timed(cold_load, 1)
+    df, timings['load_warm'] = timed(lambda: load_medals(path), repeat)
+    medals, timings['event_medals'] = timed(lambda: event_medals(df), repeat)
+    cube, timings['cube_build'] = timed(lambda: MedalCube.from_frame(medals), repeat)
+
+    def row_index():
+        dataset = MedalDataset([df], medals, cube, None, None)
+        dataset.index
+        return dataset
+
+    dataset, timings['row_index'] = timed(row_index, repeat)
+
+    # --- Filtering (what the overview does per click) ---
+    year = int(df['year'].max())
+    country = country or cube.top_nation(year)
+    year_df, timings['filter_year'] = timed(lambda: dataset.rows(year), repeat)
+    country_df, timings['filter_year_country'] = timed(lambda: dataset.rows(year, country), repeat)
+
+    # --- Figures ---
+    def treemap(frame, selected_country):
+        levels = [lvl for lvl in treemap_levels(selected_country) if lvl in SUMMARY_LEVELS]
+        return build_treemap(treemap_nodes(treemap_rows(frame), levels, treemap_root(selected_country)))
+
+    fig, timings['treemap_all'] = timed(lambda: treemap(year_df, "All"), repeat)
+    payload['treemap_all'] = payload_sizes(fig)
+    fig, timings['treemap_country'] = timed(lambda: treemap(country_df, country), repeat)
+    payload['treemap_country'] = payload_sizes(fig)
+
+    def trend():
+        nation, title_suffix = trend_target(cube, year, "All")
+        return build_trend(cube.score_history(nation), title_suffix)
+
+    fig, timings['trend'] = timed(trend, repeat)
+    payload['trend'] = payload_sizes(fig)
+    fig, timings['top5'] = timed(lambda: build_top5(top5_scores(cube, year, "All")), repeat)
+    payload['top5'] = payload_sizes(fig)
+
+    _, timings['rank_matrix'] = timed(lambda: cube.rank_matrix('gold'), repeat)
+    fig, timings['medal_race'] = timed(lambda: build_medal_race(cube, 'gold'), repeat)
+    payload['medal_race'] = payload_sizes(fig)
+
+    def evolution_tree():
+        tree = program_tree(event_history(df), df['year'].max())
+        return json.dumps(program_tree_option(tree), ensure_ascii=False)
+
+    blob, timings['evolution_tree'] = timed(evolution_tree, repeat)
+    blob = blob.encode()
+    payload['evolution_tree'] = {'json': len(blob), 'compact': len(blob), 'wire': len(zlib.compress(blob))}
+    # What the dashboard sends first: the discipline level only (events load on click)
+    children = program_tree_children(event_history(df), df['year'].max())
+    initial = json.dumps(program_tree_option(program_tree_level(children, frozenset())), ensure_ascii=False).encode()
+    payload['evolution_tree_lazy_initial'] = {'json': len(initial), 'compact': len(initial), 'wire': len(zlib.compress(initial))}
+
+    china = read_china_forecast(os.path.join(ROOT, "china_data.csv"))
+    fig, timings['sunburst'] = timed(lambda: build_sunburst(china.sunburst_df, china.sport_color_map), repeat)
+    payload['sunburst'] = payload_sizes(fig)
+
+    return {
+        'scale': scale,
+        'rows': len(df),
+        'years': int(df['year'].nunique()),
+        'nations': int(df['noc'].nunique()),
+        'events': int(df['event'].nunique()),
+        'year': year,
+        'country': country,
+        'timings_s': timings,
+        'payload_bytes': payload,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard pipeline on scaled datasets")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="result file (default: benchmarks/results/bench-<timestamp>.json)")
+    args = parser.parse_args()
+
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    report = {
+        'meta': {
+            'timestamp': stamp,
+            'git': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+        },
+        'results': [],
+    }
+    for scale in args.scale:
+        result = bench_scale(scale, args.repeat)
+        report['results'].append(result)
+        slowest = sorted(result['timings_s'].items(), key=lambda kv: -kv[1]['median'])[:3]
+        print(f"x{scale} ({result['rows']} rows): " + ", ".join(f"{k} {v['median'] * 1000:.1f} ms" for k, v in slowest))
+        print("  payload (json -> compact -> wire): " + ", ".join(
+            f"{k} {v['json'] / 1e3:.1f} -> {v['compact'] / 1e3:.1f} -> {v['wire'] / 1e3:.1f} kB"
+            for k, v in result['payload_bytes'].items()))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"bench-{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {output}")
@@ -0,0 +1,111 @@
+import pandas as pd
+
+from olympic_data import read_only
+
+# ==========================================
+# China team Milan 2026 prediction model
+# ==========================================
+# china_data.csv (one row per athlete) shaped into the Sport -> Athlete
+# hierarchy the sunburst and the athlete cards use.
+
+SPORT_COLORS = [
+    "#FFB3B3",
+    "#FFD6A5",
+    "#FFF59D",
+    "#C8E6C9",
+    "#BBDEFB",
+    "#D1C4E9",
+    "#F8BBD0",
+    "#B2EBF2",
+]
+
+
+class ChinaForecast:
+
+    def __init__(self, china_df):
+        china_df = china_df.fillna("")
+
+        # --- DATA PROCESSING FOR HIERARCHY ---
+        # 1. Group by Sport to get total medals for the parent node
+        sport_group = china_df.groupby(['sport', 'icon'])['medals'].sum().reset_index()
+        sport_group['label'] = sport_group['sport']
+        sport_group['id'] = sport_group['sport'] + " " + sport_group['icon']
+        sport_group['parent'] = "" # Root nodes
+
+        # 2. Create Athlete nodes (Children)
+        china_df['parent'] = china_df['sport'] + " " + china_df['icon']
+        china_df['label'] = china_df['athlete']
+        china_df['id'] = china_df['parent'] + " - " + china_df['athlete'] # Unique ID
+
+        # 3. Combine for Sunburst
+        # Sunburst needs: id, label, parent, value
+        # Parent nodes (Sports)
+        df_parents = sport_group[['id', 'label', 'parent', 'medals', 'sport', 'icon']].copy()
+        df_parents['athlete'] = ""
+        df_parents['desc'] = ""
+        df_parents['img'] = ""
+
+        # Child nodes (Athletes)
+        df_children = china_df[['id', 'label', 'parent', 'medals', 'sport', 'icon', 'athlete', 'desc', 'img']].copy()
+
+        # Shared by every session, so the frames are read-only
+        self.athletes = read_only(china_df)
+        self.sunburst_df = read_only(pd.concat([df_parents, df_children], axis=0))
+
+        unique_sports = self.sunburst_df['sport'].dropna().unique().tolist()
+        self.sport_color_map = {sport: SPORT_COLORS[i % len(SPORT_COLORS)] for i, sport in enumerate(unique_sports)}
+
+        # --- LOOKUP INDEXES ---
+        # Resolving a sunburst click is a dictionary hit instead of DataFrame scans
+        records = china_df.to_dict('records')
+        self.sport_athletes = {}  # sport -> athlete records, in file order
+        for rec in records:
+            self.sport_athletes.setdefault(rec['sport'], []).append(rec)
+        self.athlete_records = {}  # athlete -> record (first row wins)
+        for rec in records:
+            self.athlete_records.setdefault(rec['athlete'], rec)
+        # sunburst id -> (kind, key)
+        self.nodes = {node_id: ('sport', sport) for node_id, sport in zip(sport_group['id'], sport_group['sport'])}
+        self.nodes.update({rec['id']: ('athlete', rec['athlete']) for rec in records})
+
+    @property
+    def empty(self):
+        return self.athletes.empty
+
+    # --- CARD CONTENT ---
+    # Each view is (sport name, sport icon, athlete records, predicted medals)
+    def sport_view(self, sport):
+        athletes = self.sport_athletes[sport]
+        return sport, athletes[0]['icon'], athletes, sum(a['medals'] for a in athletes)
+
+    def athlete_view(self, athlete):
+        rec = self.athlete_records[athlete]
+        return rec['sport'], rec['icon'], [rec], rec['medals']
+
+    def default_view(self):
+        # First sport in the file
+        return self.sport_view(next(iter(self.sport_athletes)))
+
+    def resolve(self, node_id="", label=""):
+        # View for a clicked sunburst node, or None if nothing matches
+        kind_key = self.nodes.get(node_id)
+        if kind_key is not None:
+            kind, key = kind_key
+            return self.sport_view(key) if kind == 'sport' else self.athlete_view(key)
+
+        clicked_label = label or node_id
+        if not clicked_label:
+            return None
+        if clicked_label in self.sport_athletes:
+            return self.sport_view(clicked_label)
+        # Labels that carry the sport name, e.g. "自由式滑雪 ⛷️"
+        for sport in self.sport_athletes:
+            if sport in clicked_label:
+                return self.sport_view(sport)
+        if clicked_label in self.athlete_records:
+            return self.athlete_view(clicked_label)
+        return None
+
+
+def read_china_forecast(csv_path):
+    return ChinaForecast(pd.read_csv(csv_path))
@@ -0,0 +1,286 @@
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+import plotly
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+from china_forecast import read_china_forecast
+from figures import (
+    build_overview, build_sunburst, country_options, program_tree, program_tree_option, trend_target,
+    view_rows,
+)
+from olympic_data import get_store
+
+# ==========================================
+# Static export
+# ==========================================
+# Pre-renders every dashboard view for serving without Python:
+#   export/<year>/<country>.html / .json   treemap, trend line, top-5 bars per filter
+#   export/evolution.html / .json          program history tree (ECharts option)
+#   export/plotly.min.js, echarts.min.js   the JS bundles, so pages load nothing from the network
+#   export/china.html / .json              China prediction sunburst + athlete cards
+#   export/index.html                      links to all of the above
+# Views are rendered in a process pool with the same builders app.py uses.
+# export/manifest.json records a hash of every view's inputs (and of the JS
+# bundles); whatever did not change is skipped on the next run.
+#
+# ECharts is not a Python package: its bundle is vendored as vendor/echarts.min.js
+# (echarts 5.4.1 dist/echarts.min.js, Apache-2.0, see vendor/LICENSE-echarts).
+# Without it the program history page is skipped.
+#
+#   python export.py [--out export] [--workers 4] [--force]
+
+# Bump when the page layout below changes, so every view is rendered again
+EXPORT_VERSION = "1"
+
+DATA_PATH = "data.csv"
+CHINA_PATH = "china_data.csv"
+ECHARTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vendor", "echarts.min.js")
+
+PAGE = """<!DOCTYPE html>
+<html lang="zh">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+{scripts}
+<style>
+body {{ background: #1b1035; color: #eee; font-family: 'Noto Sans SC', 'Microsoft YaHei', sans-serif; margin: 24px; }}
+a {{ color: #FFD700; }}
+.card {{ background: rgba(255,255,255,0.08); border-radius: 12px; padding: 12px 16px; margin: 8px 0; }}
+</style>
+</head>
+<body>
+<p><a href="{home}">← index</a></p>
+<h1>{title}</h1>
+{body}
+</body>
+</html>
+"""
+
+_dataset = None
+
+
+def slug(name):
+    return re.sub(r"[^\w-]+", "_", str(name)).strip("_")
+
+
+def view_path(year, country):
+    return os.path.join(str(year), slug(country))
+
+
+def _digest(*parts):
+    h = hashlib.sha1(EXPORT_VERSION.encode())
+    h.update(plotly.__version__.encode())
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else str(part).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _frame_bytes(frame):
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes()
+
+
+def overview_inputs(dataset, year, country):
+    # Hash of everything an overview view is built from: its rows, the trend nation's
+    # history and the year's nation scores
+    cube = dataset.cube
+    rows = view_rows(dataset, year, country)[['discipline_clean', 'Country', 'medal', 'score']]
+    scores = cube.nation_scores(year)
+    history = cube.score_history(trend_target(cube, year, country)[0])
+    return _digest("overview", year, country, _frame_bytes(rows), _frame_bytes(scores.reset_index()), _frame_bytes(history))
+
+
+def _write(out_dir, rel_path, text):
+    path = os.path.join(out_dir, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return len(text.encode())
+
+
+def _page(title, body, depth, scripts=""):
+    home = "../" * depth + "index.html"
+    return PAGE.format(title=html.escape(title), body=body, home=home, scripts=scripts)
+
+
+def _script(depth, name):
+    return f'<script src="{"../" * depth}{name}"></script>'
+
+
+def script_assets():
+    # {file name: (digest, text loader)} of the JS bundles copied next to the pages
+    assets = {'plotly.min.js': (_digest("plotly.min.js"), get_plotlyjs)}
+    if os.path.exists(ECHARTS_PATH):
+        with open(ECHARTS_PATH, "rb") as f:
+            echarts_js = f.read()
+        assets['echarts.min.js'] = (_digest("echarts.min.js", echarts_js), echarts_js.decode)
+    return assets
+
+
+# --- Workers (one dataset per process) ---
+def _init_worker(csv_path):
+    global _dataset
+    _dataset = get_store(csv_path).current()
+    _dataset.index  # Concatenate and index the rows once per worker, not per view
+
+
+def render_overview(out_dir, year, country):
+    overview = build_overview(view_rows(_dataset, year, country), _dataset.cube, year, country)
+    figures = {'treemap': overview.tree, 'trend': overview.trend, 'top5': overview.bar}
+    figures = {name: fig for name, fig in figures.items() if fig is not None}
+
+    rel = view_path(year, country)
+    size = _write(out_dir, rel + ".json", json.dumps(
+        {name: json.loads(pio.to_json(fig, validate=False)) for name, fig in figures.items()}, ensure_ascii=False))
+    body = "\n".join(pio.to_html(fig, full_html=False, include_plotlyjs=False) for fig in figures.values())
+    size += _write(out_dir, rel + ".html", _page(f"Winter Olympics {year} · {country}", body, 1, _script(1, "plotly.min.js")))
+    return size
+
+
+def render_evolution(out_dir):
+    option = program_tree_option(program_tree(_dataset.events, _dataset.latest_year))
+    blob = json.dumps(option, ensure_ascii=False)
+    body = f"""<div id="tree" style="height: 800px;"></div>
+<script>echarts.init(document.getElementById("tree")).setOption({blob});</script>"""
+    size = _write(out_dir, "evolution.json", blob)
+    size += _write(out_dir, "evolution.html", _page("冬奥项目百年变迁 (Olympic Program History)", body, 0,
+                                                   _script(0, "echarts.min.js")))
+    return size
+
+
+def render_china(out_dir, china_path):
+    china = read_china_forecast(china_path)
+    views = [china.sport_view(sport) for sport in china.sport_athletes]
+    cards = [
+        {'sport': sport, 'icon': icon, 'total': int(total),
+         'athletes': [{'athlete': a['athlete'], 'desc': a['desc'], 'medals': int(a['medals']), 'img': a['img']}
+                      for a in athletes]}
+        for sport, icon, athletes, total in views
+    ]
+    fig = build_sunburst(china.sunburst_df, china.sport_color_map)
+    size = _write(out_dir, "china.json", json.dumps(
+        {'sunburst': json.loads(pio.to_json(fig, validate=False)), 'sports': cards}, ensure_ascii=False))
+
+    body = [pio.to_html(fig, full_html=False, include_plotlyjs=False)]
+    for card in cards:
+        body.append(f'<div class="card"><h2>{html.escape(card["sport"])} {card["icon"]} · 预测: {card["total"]} 枚</h2>')
+        for a in card['athletes']:
+            body.append(f'<p><b>{html.escape(a["athlete"])}</b> ({a["medals"]}) {html.escape(str(a["desc"]))}</p>')
+        body.append("</div>")
+    size += _write(out_dir, "china.html", _page("中国代表团米兰冬奥会预测", "\n".join(body), 0, _script(0, "plotly.min.js")))
+    return size
+
+
+def _render(job, out_dir, china_path):
+    kind, args = job[0], job[1:]
+    start = time.perf_counter()
+    if kind == 'overview':
+        size = render_overview(out_dir, *args)
+    elif kind == 'evolution':
+        size = render_evolution(out_dir)
+    else:
+        size = render_china(out_dir, china_path)
+    return job, size, time.perf_counter() - start
+
+
+# --- Driver ---
+def plan(dataset, china_path, with_evolution=True):
+    # {job: input hash} for every view; job = ('overview', year, country) | ('evolution',) | ('china',)
+    jobs = {}
+    for year in sorted((int(y) for y in dataset.cube.years), reverse=True):
+        # Every nation the dashboard offers, for the years it has medal rows in
+        for country in ["All"] + [c for c in country_options(dataset.cube)[1:] if (year, c) in dataset.index.spans]:
+            jobs[('overview', year, country)] = overview_inputs(dataset, year, country)
+    if with_evolution:
+        jobs[('evolution',)] = _digest("evolution", _frame_bytes(dataset.events), dataset.latest_year)
+    with open(china_path, "rb") as f:
+        jobs[('china',)] = _digest("china", f.read())
+    return jobs
+
+
+def write_index(out_dir, jobs):
+    pages = [("evolution.html", "Olympic Program History")] if ('evolution',) in jobs else []
+    pages.append(("china.html", "China Milan 2026"))
+    links = ["<p>" + " · ".join(f'<a href="{href}">{title}</a>' for href, title in pages) + "</p>"]
+    by_year = {}
+    for job in jobs:
+        if job[0] == 'overview':
+            by_year.setdefault(job[1], []).append(job[2])
+    for year, countries in by_year.items():
+        items = " · ".join(f'<a href="{view_path(year, c)}.html">{html.escape(c)}</a>' for c in countries)
+        links.append(f"<p><b>{year}</b>: {items}</p>")
+    body = "\n".join(links)
+    _write(out_dir, "index.html", _page("2026米兰冬奥会 Dashboard", body, 0).replace('<p><a href="index.html">← index</a></p>\n', ""))
+
+
+def export(out_dir="export", workers=None, force=False, csv_path=DATA_PATH, china_path=CHINA_PATH):
+    start = time.perf_counter()
+    dataset = get_store(csv_path).current()
+    assets = script_assets()
+    if 'echarts.min.js' not in assets:
+        print(f"warning: {ECHARTS_PATH} not found, skipping the program history page")
+    jobs = plan(dataset, china_path, with_evolution='echarts.min.js' in assets)
+
+    manifest_path = os.path.join(out_dir, "manifest.json")
+    manifest = {}
+    if not force and os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    keys = {job: json.dumps(job, ensure_ascii=False) for job in jobs}
+    todo = [job for job, digest in jobs.items() if manifest.get(keys[job]) != digest]
+
+    os.makedirs(out_dir, exist_ok=True)
+    # Bundles are rewritten whenever their digest changes (e.g. a plotly upgrade)
+    asset_keys = {name: json.dumps(['asset', name]) for name in assets}
+    for name, (digest, text) in assets.items():
+        if manifest.get(asset_keys[name]) != digest or not os.path.exists(os.path.join(out_dir, name)):
+            _write(out_dir, name, text())
+            manifest[asset_keys[name]] = digest
+
+    written, render_s = 0, 0.0
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(csv_path,)) as pool:
+            futures = [pool.submit(_render, job, out_dir, china_path) for job in todo]
+            for future in as_completed(futures):
+                job, size, seconds = future.result()
+                manifest[keys[job]] = jobs[job]  # Recorded as soon as the view is on disk
+                written += size
+                render_s += seconds
+
+    # Views that no longer exist (e.g. a nation dropped out of the filter) are forgotten
+    manifest = {key: manifest[key] for key in list(keys.values()) + list(asset_keys.values()) if key in manifest}
+    write_index(out_dir, jobs)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=0)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'views': len(jobs),
+        'rendered': len(todo),
+        'skipped': len(jobs) - len(todo),
+        'bytes': written,
+        'elapsed_s': round(elapsed, 3),
+        'render_s': round(render_s, 3),  # Summed over workers; > elapsed_s when the pool helps
+        'views_per_s': round(len(todo) / elapsed, 1) if elapsed else None,
+        'mb_per_s': round(written / elapsed / 1e6, 2) if elapsed else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-render every dashboard view to static HTML/JSON")
+    parser.add_argument("--out", default="export")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="render every view, ignoring the manifest")
+    args = parser.parse_args()
+    report = export(args.out, args.workers, args.force)
+    print(f"{report['rendered']} of {report['views']} views rendered ({report['skipped']} unchanged) "
+          f"in {report['elapsed_s']} s: {report['views_per_s']} views/s, {report['mb_per_s']} MB/s")
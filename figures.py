@@ -0,0 +1,676 @@
+import json
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# ==========================================
+# Figure builders
+# ==========================================
+
+# We want to color by score (Gold=3, Silver=2, Bronze=1)
+# This naturally makes Gold blocks "warmer/brighter"
+TREEMAP_COLORSCALE = [
+    [0.0, 'rgba(173, 216, 230, 0.5)'], # Light Blue (Ice/Bronze-ish low)
+    [0.5, 'rgba(255, 255, 255, 0.8)'], # White (Silver-ish mid)
+    [1.0, '#FFD700']  # Gold (High)
+]
+
+# Levels shipped pre-aggregated to the browser; everything below is drill-down
+SUMMARY_LEVELS = ['discipline_clean', 'Country', 'medal']
+DETAIL_LEVELS = ['event', 'Athlete']
+
+
+# --- TREEMAP ---
+def treemap_levels(selected_country):
+    # Discipline -> Country -> Medal -> Event -> Athlete
+    # If a country is selected, the Country level is redundant. Show Discipline directly.
+    levels = SUMMARY_LEVELS + DETAIL_LEVELS
+    if selected_country != "All":
+        levels = [lvl for lvl in levels if lvl != 'Country']
+    return levels
+
+
+def treemap_root(selected_country):
+    return "All Events" if selected_country == "All" else selected_country
+
+
+def treemap_rows(frame):
+    # Rename 'as' column to 'Athlete' if it exists, for better labeling
+    if 'as' in frame.columns:
+        frame = frame.rename(columns={'as': 'Athlete'})
+    else:
+        frame = frame.assign(Athlete='Unknown')
+    # Fill NaNs for display
+    return frame.assign(
+        event=frame['event'].astype(object).fillna('Unknown Event'),
+        Athlete=frame['Athlete'].fillna('Unknown Athlete'),
+    )
+
+
+def treemap_nodes(frame, levels, root_label):
+    # One row per treemap node (id / parent / label / value / color), aggregated
+    # server-side so the browser never sees more nodes than it can display.
+    # value = number of medal rows, color = mean score (what px.treemap shows).
+    nodes = [pd.DataFrame({
+        'id': [root_label], 'parent': [''], 'label': [root_label],
+        'value': [len(frame)], 'score': [frame['score'].sum()],
+    })]
+    for depth in range(1, len(levels) + 1):
+        keys = levels[:depth]
+        grouped = frame.groupby(keys, observed=True)['score'].agg(['size', 'sum']).reset_index()
+        parent = pd.Series(root_label, index=grouped.index)
+        for key in keys[:-1]:
+            parent = parent + "/" + grouped[key].astype(str)
+        label = grouped[keys[-1]].astype(str)
+        level_nodes = grouped[keys].astype(str).assign(
+            id=parent + "/" + label, parent=parent, label=label,
+            value=grouped['size'], score=grouped['sum'],
+        )
+        nodes.append(level_nodes)
+
+    nodes = pd.concat(nodes, ignore_index=True)
+    nodes['color'] = nodes['score'] / nodes['value'].where(nodes['value'] > 0)
+    return nodes
+
+
+def drilldown_rows(frame, nodes, node_id, levels):
+    # Rows and remaining levels underneath one summary node (None for the root / unknown ids)
+    match = nodes[nodes['id'] == node_id]
+    if match.empty or not match.iloc[0]['parent']:
+        return None, []
+    node = match.iloc[0]
+    fixed = [lvl for lvl in levels if lvl in nodes.columns and isinstance(node[lvl], str)]
+    mask = pd.Series(True, index=frame.index)
+    for lvl in fixed:
+        mask &= frame[lvl].astype(str) == node[lvl]
+    return frame[mask], [lvl for lvl in levels if lvl not in fixed]
+
+
+def build_treemap(nodes, maxdepth=3):
+    fig_tree = go.Figure(go.Treemap(
+        ids=nodes['id'],
+        labels=nodes['label'],
+        parents=nodes['parent'],
+        values=nodes['value'],
+        branchvalues='total',
+        marker=dict(
+            colors=nodes['color'],
+            colorscale=TREEMAP_COLORSCALE,
+            showscale=False, # Hide the color bar for cleaner look
+            # Add borders
+            line=dict(width=1.5, color='rgba(255,255,255,0.7)'),
+            pad=dict(t=2, l=2, r=2, b=2)
+        ),
+        maxdepth=maxdepth, # Initially show up to Country/Medal level to avoid clutter
+        tiling=dict(packing='squarify'),
+        textinfo="label+value"
+    ))
+
+    fig_tree.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(t=0, l=0, r=0, b=0),
+        font=dict(color='white', family="Helvetica Neue"),
+        hoverlabel=dict(
+            bgcolor="rgba(11, 16, 38, 0.9)",
+            font_size=14,
+            font_family="Helvetica Neue"
+        )
+    )
+    return fig_tree
+
+
+# --- TREND LINE (The Ski Track) ---
+def trend_target(cube, selected_year, selected_country):
+    # Logic for "All": Show the trend of the TOP NATION of the CURRENTLY SELECTED YEAR
+    # Logic for Specific Country: Show that country's trend
+    if selected_country == "All":
+        trend_nation = cube.top_nation(selected_year)
+        if trend_nation is None:
+            return None, "No Data"
+        return trend_nation, f"Top Nation of {selected_year}: {trend_nation}"
+    return selected_country, selected_country
+
+
+def build_trend(trend_data, title_suffix):
+    fig_line = px.line(trend_data, x='year', y='score', markers=True)
+
+    # Make it look like a ski track (Smooth Spline, Glow)
+    fig_line.update_traces(
+        line_shape='spline',
+        line_color='#00d2ff',
+        line_width=4,
+        marker=dict(size=10, color='white', line=dict(width=2, color='#00d2ff'))
+    )
+
+    # Remove grid, add "Glow" shadow via drop-shadow filter (in CSS usually, but here we simulate with layout)
+    fig_line.update_layout(
+        title=dict(text=f"Medal Score History ({title_suffix})", font=dict(color='white')),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(255,255,255,0.02)',
+        font=dict(color='white'),
+        xaxis=dict(
+            showgrid=False,
+            gridcolor='rgba(255,255,255,0.05)',
+            zeroline=False,
+            showline=False
+        ),
+        yaxis=dict(
+            showgrid=False,
+            gridcolor='rgba(255,255,255,0.05)',
+            zeroline=False,
+            showline=False
+        ),
+        margin=dict(t=40, l=10, r=10, b=10),
+        hovermode="x unified"
+    )
+    return fig_line
+
+
+# --- MULTI-NATION COMPARISON ---
+COMPARE_METRICS = {'score': '积分', 'Total': '奖牌总数', 'Gold': '金牌', 'Silver': '银牌', 'Bronze': '铜牌'}
+
+
+def build_comparison(compare_data, metric):
+    fig = px.line(compare_data, x='year', y=metric, color='Country', markers=True)
+    fig.update_traces(line_shape='spline', line_width=3, marker=dict(size=7))
+    fig.update_layout(
+        title=dict(text=f"Nation Comparison ({COMPARE_METRICS[metric]})", font=dict(color='white')),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(255,255,255,0.02)',
+        font=dict(color='white'),
+        xaxis=dict(showgrid=False, zeroline=False, showline=False),
+        yaxis=dict(showgrid=False, zeroline=False, showline=False),
+        legend=dict(title=None, orientation="h", y=-0.15),
+        margin=dict(t=40, l=10, r=10, b=10),
+        hovermode="x unified"
+    )
+    return fig
+
+
+# --- MEDAL TABLE RACE ---
+RACE_ORDERS = {'gold': '金牌优先 (官方排名)', 'score': '积分 (3-2-1)'}
+RACE_TOP = 12
+RACE_FRAME_MS = 900
+
+
+def build_medal_race(cube, order='gold', top=RACE_TOP):
+    # Animated top-N medal table, one frame per Games, all frames taken from the rank matrix.
+    # Bars are keyed by nation (ids) so they slide to their new place between frames.
+    ranks = cube.rank_matrix(order)
+    counts = cube.nation_counts
+    value = cube.nation_totals if order == 'score' else counts[..., 0]
+    countries = np.array(cube.countries, dtype=object)
+    palette = px.colors.qualitative.Alphabet
+    colors = np.array([palette[j % len(palette)] for j in range(len(countries))], dtype=object)
+
+    unranked = np.iinfo(np.int32).max
+    leaders = np.argsort(np.where(ranks > 0, ranks, unranked), axis=1, kind='stable')[:, :top]
+    x_max = float(value.max()) * 1.15 or 1
+
+    # Frames only carry what changes; the label is assembled in the browser from the
+    # nation name and a (rank, gold, silver, bronze) number array
+    frames = []
+    for i, year in enumerate(cube.years):
+        idx = leaders[i][ranks[i, leaders[i]] > 0]
+        frames.append(go.Frame(name=str(int(year)), data=[go.Bar(
+            x=value[i, idx],
+            y=np.arange(1, len(idx) + 1),
+            ids=countries[idx],
+            text=countries[idx],
+            customdata=np.column_stack([ranks[i, idx], counts[i, idx]]),
+            marker_color=colors[idx],
+        )]))
+
+    label = "%{customdata[0]}. %{text}  🥇%{customdata[1]} 🥈%{customdata[2]} 🥉%{customdata[3]}"
+    bars = [go.Bar(frames[0].data[0]).update(
+        orientation='h', texttemplate=label, hovertemplate=label + "<extra></extra>",
+        textposition='inside', insidetextanchor='start',
+    )] if frames else []
+
+    play = dict(frame=dict(duration=RACE_FRAME_MS, redraw=True), transition=dict(duration=RACE_FRAME_MS // 2), fromcurrent=True)
+    fig = go.Figure(data=bars, frames=frames)
+    fig.update_layout(
+        title=dict(text=f"Medal Table Race ({'Gold-first' if order == 'gold' else 'Score'})", font=dict(color='white')),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(255,255,255,0.02)',
+        font=dict(color='white'),
+        height=520,
+        xaxis=dict(range=[0, x_max], showgrid=False, zeroline=False, title='Gold medals' if order == 'gold' else 'Score'),
+        yaxis=dict(autorange='reversed', showticklabels=False, showgrid=False),
+        margin=dict(t=40, l=10, r=10, b=10),
+        updatemenus=[dict(
+            type='buttons', showactive=False, x=0, y=-0.08, xanchor='left', yanchor='top', direction='left',
+            buttons=[
+                dict(label='▶', method='animate', args=[None, play]),
+                dict(label='⏸', method='animate', args=[[None], dict(frame=dict(duration=0, redraw=False), mode='immediate')]),
+            ],
+        )],
+        sliders=[dict(
+            x=0.1, y=-0.05, len=0.9, currentvalue=dict(prefix="Year: ", font=dict(color='white')),
+            steps=[dict(label=f.name, method='animate',
+                        args=[[f.name], dict(mode='immediate', frame=dict(duration=0, redraw=True), transition=dict(duration=0))])
+                   for f in frames],
+        )],
+    )
+    return fig
+
+
+# --- TOP 5 BARS ---
+def top5_scores(cube, selected_year, selected_country):
+    if selected_country == "All":
+        return cube.top_nations(selected_year, 5)
+    medal_counts = cube.nation_scores(selected_year)
+    return medal_counts[medal_counts.index == selected_country]
+
+
+def build_top5(medal_counts):
+    fig_bar = go.Figure(go.Bar(
+        x=medal_counts.values,
+        y=medal_counts.index,
+        orientation='h',
+        text=medal_counts.values
+    ))
+    fig_bar.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='white'),
+        margin=dict(t=0, l=0, r=50, b=0), # Increased right margin for labels
+        xaxis=dict(visible=False),
+        yaxis=dict(autorange="reversed"),
+        height=200,
+        barcornerradius=5
+    )
+    fig_bar.update_traces(
+        marker_color='rgba(255, 215, 0, 0.8)', # Soft Gold
+        textposition='outside',
+        cliponaxis=False, # Allow text to extend beyond axis
+        marker_line_width=0
+    )
+    return fig_bar
+
+
+# --- OLYMPIC PROGRAM EVOLUTION (ECharts Tree) ---
+def program_tree_children(history, latest_year):
+    # {discipline: event nodes}, with start/end year and status per event.
+    # Labels, values and styles for all events are computed column-wise in one pass.
+    start, end = history['min'], history['max']
+    evt = history['event'].astype(str)
+    is_active = end == latest_year
+    # Highlight New Events (e.g. started in last 2 cycles)
+    is_new = is_active & (start >= latest_year - 4)
+
+    label = evt.where(~is_new, "✨ " + evt).where(is_active, "❌ " + evt)
+    time_str = start.astype(str) + " - " + end.astype(str).where(~is_active, "Present")
+    color = np.select(
+        [is_new, is_active],
+        ["#00FF7F", "#87CEFA"], # New Green, Active Blue
+        "#FF6347" # Discontinued Red
+    )
+    label_color = np.where(is_active, "#fff", "#aaa")
+
+    children = {}
+    for disc, name, value, item_color, text_color in zip(
+        history['discipline_clean'].astype(str).tolist(), label.tolist(), time_str.tolist(),
+        color.tolist(), label_color.tolist()
+    ):
+        children.setdefault(disc, []).append({
+            "name": name,
+            "value": value, # Tooltip value
+            "itemStyle": {"color": item_color},
+            "label": {"color": text_color}
+        })
+    return children
+
+
+def program_tree_level(children, expanded=None):
+    # Root -> Discipline [-> Events]. expanded=None: every discipline with its events
+    # (static export). Otherwise only the expanded disciplines carry their events; the
+    # rest hold one placeholder, so they still draw as collapsed branches and a click
+    # asks the server for the real children.
+    nodes = []
+    for disc in sorted(children):
+        node = {"name": disc, "kind": "discipline"}
+        if expanded is None:
+            node["children"] = children[disc]
+        elif disc in expanded:
+            node.update(children=children[disc], collapsed=False)
+        else:
+            node.update(children=[{"name": f"{len(children[disc])} events", "value": "loading…"}], collapsed=True)
+        nodes.append(node)
+    return {"name": "❄️ Winter Olympics", "children": nodes}
+
+
+def program_tree(history, latest_year):
+    # Full Root -> Discipline -> Events tree
+    return program_tree_level(program_tree_children(history, latest_year))
+
+
+def program_tree_option(tree_data):
+    # ECharts Options
+    return {
+        "tooltip": {
+            "trigger": "item",
+            "triggerOn": "mousemove",
+            "formatter": "{b}: {c}"
+        },
+        "series": [
+            {
+                "type": "tree",
+                "data": [tree_data],
+                "top": "5%",
+                "left": "15%",
+                "bottom": "5%",
+                "right": "20%",
+                "symbolSize": 7,
+                "label": {
+                    "position": "left",
+                    "verticalAlign": "middle",
+                    "align": "right",
+                    "fontSize": 14,
+                    "color": "#fff"
+                },
+                "leaves": {
+                    "label": {
+                        "position": "right",
+                        "verticalAlign": "middle",
+                        "align": "left"
+                    }
+                },
+                "emphasis": {
+                    "focus": "descendant"
+                },
+                "expandAndCollapse": True,
+                "animationDuration": 550,
+                "animationDurationUpdate": 750,
+                "initialTreeDepth": 1, # Only show Discipline level initially
+                "lineStyle": {
+                    "color": "rgba(255,255,255,0.5)",
+                    "curveness": 0.5
+                }
+            }
+        ]
+    }
+
+
+# --- CHINA PREDICTION SUNBURST ---
+def build_sunburst(sunburst_df, sport_color_map):
+    # Sunburst Chart with Hierarchy: Sport -> Athlete
+    # "3D Layered" effect simulated with colors and borders
+    fig_sun = px.sunburst(
+        sunburst_df,
+        ids='id',
+        names='label',
+        parents='parent',
+        values='medals',
+        color='sport',
+        color_discrete_map=sport_color_map,
+        hover_data=['sport', 'medals']
+    )
+
+    fig_sun.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(t=10, l=10, r=10, b=10), # Compact
+        font=dict(color='#263238', family="Microsoft YaHei, Noto Sans SC, PingFang SC, sans-serif", size=13),
+        uniformtext=dict(minsize=10, mode="hide"),
+    )
+
+    fig_sun.update_traces(
+        textinfo="label+value",
+        insidetextorientation='radial',
+        marker=dict(
+            line=dict(color='rgba(255,255,255,0.85)', width=2), # Strong borders for "Ice Block" look
+        ),
+        textfont=dict(
+            family="Microsoft YaHei, Noto Sans SC, PingFang SC, sans-serif",
+            size=12,
+            color="#263238",
+        ),
+        leaf=dict(opacity=0.95),
+        # No %{id} / %{parent}: compact mode turns those into base-36 codes
+        hovertemplate="<b>%{label}</b><br>sport=%{customdata[0]}<br>medals=%{customdata[1]}<extra></extra>",
+    )
+    return fig_sun
+
+
+# ==========================================
+# Compact wire format
+# ==========================================
+# st.plotly_chart sends every figure as JSON. In compact mode (the default,
+# MILAN2026_COMPACT_FIGURES=0 turns it off) shared figures are rewritten once
+# when they are cached:
+#   - hierarchy ids / parents ("All Events/Alpine Skiing/Norway/Gold", most of
+#     a treemap's bytes) become base-36 codes of the node's position, a
+#     dictionary the server keeps (full_id maps a clicked code back), so hover
+#     templates must not print %{id} / %{parent}
+#   - numeric arrays go out as typed arrays, floats as float32 and integers in
+#     the narrowest type that fits (plotly writes numpy arrays as base64 "bdata"
+#     instead of number lists)
+# On top of that the websocket is deflate-compressed (.streamlit/config.toml).
+# perf.payload_sizes reports the bytes before and after.
+COMPACT_ENV = "MILAN2026_COMPACT_FIGURES"
+COMPACT_FIGURES = os.environ.get(COMPACT_ENV, "1") != "0"
+
+# Trace attributes that hold one number per point
+NUMERIC_ARRAYS = ['x', 'y', 'values', 'marker.color', 'marker.colors']
+
+_BASE36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def short_code(pos):
+    code = ""
+    while True:
+        pos, digit = divmod(pos, 36)
+        code = _BASE36[digit] + code
+        if not pos:
+            return code
+
+
+def _typed_array(values):
+    # values as a compact numpy array, or None if they are not plain numbers
+    if values is None or isinstance(values, (str, dict)):
+        return None
+    array = np.asarray(values)
+    if array.ndim != 1 or array.dtype.kind not in "iuf":
+        return None
+    if array.dtype.kind == "f":
+        return array.astype(np.float32)
+    if not len(array):
+        return array
+    # Narrowest integer type that holds the range (small counts go out as one byte each)
+    dtype = np.promote_types(np.min_scalar_type(array.min()), np.min_scalar_type(array.max()))
+    return array.astype(dtype) if dtype.itemsize <= 4 else array
+
+
+def _compact_trace(trace):
+    if getattr(trace, 'ids', None) is not None and getattr(trace, 'parents', None) is not None:
+        codes = {node_id: short_code(pos) for pos, node_id in enumerate(trace.ids)}
+        trace.update(
+            ids=[codes[node_id] for node_id in trace.ids],
+            parents=[codes.get(parent, parent) for parent in trace.parents],
+        )
+    for path in NUMERIC_ARRAYS:
+        try:
+            array = _typed_array(trace[path])
+        except (KeyError, ValueError):
+            continue
+        if array is not None:
+            trace[path] = None  # plotly ignores an assignment that compares equal (ints -> int32)
+            trace[path] = array
+
+
+def compact_figure(fig):
+    # Rewrites a freshly built figure (and its animation frames) in place; returns it
+    if fig is None or not COMPACT_FIGURES:
+        return fig
+    for trace in fig.data:
+        _compact_trace(trace)
+    for frame in fig.frames:
+        for trace in frame.data:
+            _compact_trace(trace)
+    return fig
+
+
+def full_id(ids, point_id):
+    # Original id of a clicked hierarchy node; ids are the node ids in figure order
+    if not COMPACT_FIGURES or not point_id:
+        return point_id
+    try:
+        return np.asarray(ids)[int(point_id, 36)]
+    except (ValueError, IndexError):
+        return ""
+
+
+# ==========================================
+# Figure cache
+# ==========================================
+class FigureCache:
+    # Bounded LRU of ready-to-render figures, shared by every session.
+    # Entries are treated as read-only once stored.
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._building = {}  # key -> Event, set when the in-flight build of that key ends
+        self._lock = threading.Lock()
+        self._local = threading.local()  # per-thread counters, for per-rerun profiling
+
+    def get(self, key, build):
+        local = self._local
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    local.hits = getattr(local, 'hits', 0) + 1
+                    return self._entries[key]
+                pending = self._building.get(key)
+                if pending is None:
+                    pending = self._building[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # Someone is already building this key (e.g. a burst of viewers on one view): wait for it
+            pending.wait()
+        local.misses = getattr(local, 'misses', 0) + 1
+
+        # Build outside the lock so other keys are served meanwhile
+        try:
+            value = build()
+            with self._lock:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        finally:
+            with self._lock:
+                del self._building[key]
+            pending.set()
+        return value
+
+    def peek(self, key):
+        # The cached value, or None; never builds and leaves the statistics alone
+        with self._lock:
+            return self._entries.get(key)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def thread_stats(self):
+        # (hits, misses) seen by the calling thread, i.e. the current script run
+        return getattr(self._local, 'hits', 0), getattr(self._local, 'misses', 0)
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._entries), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses}
+
+
+# Every (year, country) view the warm-up fills, with room left for other figures
+FIGURE_CACHE = FigureCache(maxsize=1024)
+
+OverviewFigures = namedtuple('OverviewFigures', ['tree', 'tree_nodes', 'trend', 'bar'])
+
+
+def country_options(cube):
+    # Choices of the nation filter: every nation that ever won a medal, most medals first
+    return ["All"] + cube.top_countries(n=None)
+
+
+def view_rows(dataset, selected_year, selected_country):
+    # Medal rows behind one (year, country) view, looked up in the dataset's partition index
+    return dataset.rows(selected_year, selected_country)
+
+
+def build_overview(filtered_df, cube, selected_year, selected_country):
+    # Treemap, trend line and top-5 bars for one (year, country) filter
+    levels = treemap_levels(selected_country)
+    summary_levels = [lvl for lvl in levels if lvl in SUMMARY_LEVELS]
+    tree_nodes = treemap_nodes(treemap_rows(filtered_df), summary_levels, treemap_root(selected_country))
+
+    trend_nation, title_suffix = trend_target(cube, selected_year, selected_country)
+    fig_line = None
+    if trend_nation:
+        fig_line = build_trend(cube.score_history(trend_nation), title_suffix)
+
+    return OverviewFigures(
+        tree=build_treemap(tree_nodes),
+        tree_nodes=tree_nodes,
+        trend=fig_line,
+        bar=build_top5(top5_scores(cube, selected_year, selected_country)),
+    )
+
+
+def compact_overview(overview):
+    return overview._replace(
+        tree=compact_figure(overview.tree), trend=compact_figure(overview.trend), bar=compact_figure(overview.bar))
+
+
+def overview_figures(version, filtered_df, cube, selected_year, selected_country):
+    # version identifies the dataset, so new data never serves stale figures
+    key = (version, selected_year, selected_country)
+    return FIGURE_CACHE.get(
+        key, lambda: compact_overview(build_overview(filtered_df, cube, selected_year, selected_country)))
+
+
+def comparison_figure(version, cube, countries, metric):
+    # Nations are sliced out of the cube's year x nation matrix; figure shared per selection
+    key = (version, 'compare', tuple(countries), metric)
+    return FIGURE_CACHE.get(key, lambda: compact_figure(build_comparison(cube.compare(countries, metric), metric)))
+
+
+def medal_race_figure(version, cube, order):
+    # Built once per dataset and ranking, then shared: reruns only resend the cached figure
+    return FIGURE_CACHE.get((version, 'race', order), lambda: compact_figure(build_medal_race(cube, order)))
+
+
+# The program tree only depends on the dataset: per version one {discipline: events}
+# map, plus the options of the expanded-discipline combinations viewers opened
+PROGRAM_TREE_CACHE = FigureCache(maxsize=64)
+
+
+def program_tree_events(version, events, latest_year):
+    # Event nodes of every discipline, built once per dataset and handed out one discipline at a time
+    return PROGRAM_TREE_CACHE.get((version, 'events'), lambda: program_tree_children(events, latest_year))
+
+
+def program_tree_json(version, events, latest_year, expanded=frozenset()):
+    # Ready-to-send ECharts option (JSON): the discipline level plus the events of the
+    # expanded disciplines only
+    expanded = frozenset(expanded)
+
+    def build():
+        tree_data = program_tree_level(program_tree_events(version, events, latest_year), expanded)
+        return json.dumps(program_tree_option(tree_data), ensure_ascii=False)
+    return PROGRAM_TREE_CACHE.get((version, 'option', expanded), build)
+
+
+def sunburst_figure(version, china):
+    # version identifies china_data.csv; the figure is shared until the file changes
+    return FIGURE_CACHE.get(('sunburst', version), lambda: compact_figure(build_sunburst(china.sunburst_df, china.sport_color_map)))
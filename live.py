@@ -0,0 +1,207 @@
+import json
+import logging
+import os
+import re
+import statistics
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from streamlit.runtime.scriptrunner_utils.script_requests import RerunData
+
+from olympic_data import BASE_COLUMNS, get_store, invalid_medals, queue_delta
+
+# ==========================================
+# Live results feed
+# ==========================================
+# In live mode one background thread per server process tails a
+# newline-delimited JSON file (one medal per line, data.csv columns):
+#
+#   {"year": 2026, "discipline": "Short Track Speed Skating (Skating)", "event": "500 metres, Men",
+#    "as": "...", "athlete_id": 1, "noc": "CHN", "medal": "Gold"}
+#
+# Each batch of new lines is queued as a delta (data_deltas/...) and merged
+# into the shared DatasetStore right away, so an update is applied once no
+# matter how many dashboards are open. Sessions only compare the store's
+# version in memory (see live_watch in app.py), at a rate that follows the
+# feed, and when it moved rerun just the fragments that draw medal data.
+#
+#   MILAN2026_LIVE_FEED=live_results.ndjson streamlit run app.py
+#   python live.py live_results.ndjson --year 2022    -> replay a Games into the feed
+
+FEED_ENV = "MILAN2026_LIVE_FEED"
+POLL_S = 0.2  # Feed thread: how often the file is checked
+
+# Dashboards compare the store version at a rate that follows the feed (session_poll_s):
+# 2 s while results pour in, backing off to 16 s when the feed goes quiet
+SESSION_POLL_MIN_S = 2
+SESSION_POLL_MAX_S = 16
+
+logger = logging.getLogger("milan2026.live")
+
+# Delta names carry the feed offset they end at, so a restart resumes after them
+_OFFSET_RE = re.compile(r"_live-(\d+)\.csv$")
+
+_feeds = {}
+_feeds_lock = threading.Lock()
+
+
+def feed_path():
+    # Path of the live feed, or None when live mode is off
+    return os.environ.get(FEED_ENV) or None
+
+
+class ResultsFeed:
+
+    def __init__(self, path, csv_path):
+        self.path = path
+        self.csv_path = csv_path
+        self.store = get_store(csv_path)
+        self.offset = self._resume_offset()
+        self.last_update = None  # wall time of the last applied batch
+        self.update_times = deque(maxlen=9)  # wall times of the recent applied batches
+        self.rejected = 0        # lines that were not valid medal records
+        self._thread = threading.Thread(target=self._run, name="milan2026-live-feed", daemon=True)
+
+    def _resume_offset(self):
+        offsets = [int(m.group(1)) for name, _ in self.store.delta_files() for m in [_OFFSET_RE.search(name)] if m]
+        return max(offsets, default=0)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            try:
+                self.poll()
+            except Exception:  # Keep the feed alive; the next poll retries
+                logger.exception("live feed poll failed")
+            time.sleep(POLL_S)
+
+    def poll(self):
+        # Apply whatever complete lines were appended since the last poll; returns the medals applied
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return 0
+        if size < self.offset:  # Feed file was truncated / replaced: start over
+            self.offset = 0
+        if size == self.offset:
+            return 0
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            chunk = f.read(size - self.offset)
+        end = chunk.rfind(b"\n") + 1  # A half-written last line waits for the next poll
+        if not end:
+            return 0
+
+        records, rejected, applied = [], 0, 0
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if isinstance(record, dict):
+                records.append(record)
+            else:
+                rejected += 1
+        offset = self.offset + end
+
+        if records:
+            # Each record is checked on its own: a bad line never takes its batch down with it
+            batch = pd.DataFrame.from_records(records)
+            if 'type' not in batch.columns:
+                batch['type'] = 'Winter'
+            batch = batch.reindex(columns=BASE_COLUMNS)
+            bad = invalid_medals(batch)
+            rejected += int(bad.sum())
+            good = batch[~bad]
+            if len(good):
+                good = good.assign(year=pd.to_numeric(good['year']).astype('int64'))
+                queue_delta(good, f"live-{offset:012d}.csv", self.csv_path)
+                self.store.current()
+                self.last_update = time.time()
+                self.update_times.append(self.last_update)
+                applied = len(good)
+        if rejected:
+            logger.warning("rejected %d live records", rejected)
+            self.rejected += rejected
+        self.offset = offset
+        return applied
+
+    def session_poll_s(self, now=None):
+        # How often a dashboard should compare versions: about a quarter of the usual gap
+        # between result batches (or of the quiet time since the last one), in doubling
+        # steps so sessions rarely change rate
+        times = list(self.update_times)
+        if not times:
+            return SESSION_POLL_MAX_S
+        now = time.time() if now is None else now
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        gap = max(statistics.median(gaps) if gaps else 0, now - times[-1])
+        poll_s = SESSION_POLL_MIN_S
+        while poll_s < SESSION_POLL_MAX_S and poll_s * 4 < gap:
+            poll_s *= 2
+        return poll_s
+
+
+def start_feed(path, csv_path):
+    # The process-wide feed for path (started on first call)
+    with _feeds_lock:
+        feed = _feeds.get(path)
+        if feed is None:
+            feed = _feeds[path] = ResultsFeed(path, csv_path).start()
+        return feed
+
+
+def rerun_fragments(keys):
+    # Rerun the keyed fragments of this session from inside a (timed) fragment run.
+    # st.rerun(keys) is only allowed from widget callbacks, so this queues the same
+    # fragment-scoped rerun request itself; streamlit is pinned to the minor version
+    # this was written against (requirements.txt, tests/test_live.py).
+    ctx = get_script_run_ctx()
+    try:
+        ids = ctx.fragment_storage.resolve_target(keys)
+    except StreamlitAPIException:  # One of them hasn't rendered in this session yet
+        st.rerun()
+    ctx.script_requests.request_rerun(RerunData(
+        query_string=ctx.query_string,
+        page_script_hash=ctx.page_script_hash,
+        fragment_id_queue=ids,
+        is_fragment_scoped_rerun=True,
+        cached_message_hashes=ctx.cached_message_hashes,
+        context_info=ctx.context_info,
+    ))
+    st.empty()  # Yield point: the script runner picks the request up here
+
+
+def simulate(path, csv_path="data.csv", year=2022, rate=2.0):
+    # Stand-in results source: replay one Games from data.csv into the feed, rate lines per second
+    rows = pd.read_csv(csv_path)
+    rows = rows[rows['year'] == year]
+    with open(path, "a", encoding="utf-8") as f:
+        for rec in rows.to_dict('records'):
+            rec['year'] = int(rec['year']) + 4  # Pretend it is the next Games
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            f.flush()
+            print(rec['year'], rec['noc'], rec['medal'], rec['event'])
+            time.sleep(1 / rate)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay a year of data.csv into a live results feed")
+    parser.add_argument("feed", help="newline-delimited JSON feed file")
+    parser.add_argument("--year", type=int, default=2022, help="Games to replay (shifted to the next one)")
+    parser.add_argument("--rate", type=float, default=2.0, help="records per second")
+    args = parser.parse_args()
+    simulate(args.feed, year=args.year, rate=args.rate)
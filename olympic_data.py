@@ -0,0 +1,708 @@
+import logging
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# ==========================================
+# Olympic medal data layer
+# ==========================================
+# data.csv is parsed and cleaned once into a typed columnar file (Arrow IPC /
+# Feather v2, uncompressed so it can be memory-mapped). load_medals() maps that
+# file and only goes back to the CSV when the columnar copy is missing or stale.
+#
+#   python olympic_data.py [data.csv]              -> (re)build data.arrow
+#   python olympic_data.py --append results.csv    -> queue new results (see DatasetStore)
+
+try:
+    import pyarrow as pa
+except ImportError:  # Columnar cache is optional, CSV always works
+    pa = None
+
+# Map NOC to Country Names (Simplified)
+NOC_MAP = {
+    'USA': 'United States', 'CHN': 'China', 'NOR': 'Norway', 'GER': 'Germany',
+    'AUT': 'Austria', 'CAN': 'Canada', 'ITA': 'Italy', 'FRA': 'France',
+    'SWE': 'Sweden', 'SUI': 'Switzerland', 'NED': 'Netherlands', 'RUS': 'Russia',
+    'FIN': 'Finland', 'JPN': 'Japan', 'KOR': 'South Korea'
+}
+
+# Score for sorting (Gold=3, Silver=2, Bronze=1)
+MEDAL_SCORE = {'Gold': 3, 'Silver': 2, 'Bronze': 1}
+MEDALS = list(MEDAL_SCORE)
+
+# Columns of data.csv; a delta file needs all of them except type
+BASE_COLUMNS = ['year', 'type', 'discipline', 'event', 'as', 'athlete_id', 'noc', 'medal']
+REQUIRED_COLUMNS = [c for c in BASE_COLUMNS if c != 'type']
+
+# One awarded medal: team events list every member as a row, the medal table counts the team once.
+# In individual events every medallist counts, ties included (three USA silvers in the 1968
+# women's 500 m), so 'entrant' is the athlete id there and 0 in team events.
+# Event names repeat across disciplines ("Team" etc.), so the discipline is part of the key.
+EVENT_KEY = ['year', 'discipline_clean', 'event', 'noc', 'medal', 'entrant']
+
+# Team events by name: relays, crews, pairs, hockey and curling teams
+TEAM_EVENT_RE = r"\b(?:Relay|Team|Two|Four|Pairs|Doubles|Ice Hockey|Curling|Ice Dancing|Patrol)\b"
+
+# Low-cardinality text columns stored dictionary-encoded / categorical
+CATEGORICAL_COLUMNS = ['type', 'discipline', 'discipline_clean', 'event', 'noc', 'Country', 'medal']
+
+# Bump when the derived columns change so old columnar files get rebuilt
+FORMAT_VERSION = "2"
+
+
+def columnar_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".arrow"
+
+
+def file_signature(path):
+    # Cheap change detector: (mtime_ns, size) of the source file
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def prepare_medals(df):
+    # Derive the columns the dashboard needs, all vectorized
+    # 1. Clean Discipline names: "Alpine Skiing (Skiing)" -> "Alpine Skiing"
+    if 'discipline' in df.columns:
+        df['discipline_clean'] = df['discipline'].str.split('(', n=1).str[0].str.strip()
+
+    # 2. Map NOC to Country Names
+    df['Country'] = df['noc'].map(NOC_MAP).fillna(df['noc'])
+
+    # 3. Score for sorting
+    df['score'] = df['medal'].map(MEDAL_SCORE).fillna(0).astype('int8')
+
+    # 4. Who the medal belongs to (see EVENT_KEY)
+    team = df['event'].astype(str).str.contains(TEAM_EVENT_RE, regex=True)
+    df['entrant'] = df['athlete_id'].where(~team, 0).astype('int64')
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def read_medals_csv(csv_path):
+    return prepare_medals(pd.read_csv(csv_path))
+
+
+def _source_metadata(csv_path):
+    mtime_ns, size = file_signature(csv_path)
+    return {
+        b"source_mtime_ns": str(mtime_ns).encode(),
+        b"source_size": str(size).encode(),
+        b"format_version": FORMAT_VERSION.encode(),
+    }
+
+
+def is_fresh(csv_path, arrow_path=None):
+    # The columnar file is fresh if it was built from the current CSV by the current code
+    arrow_path = arrow_path or columnar_path(csv_path)
+    if pa is None or not os.path.exists(arrow_path):
+        return False
+    try:
+        with pa.memory_map(arrow_path) as source:
+            meta = pa.ipc.open_file(source).schema.metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return False
+    expected = _source_metadata(csv_path)
+    return all(meta.get(k) == v for k, v in expected.items())
+
+
+def ingest(csv_path, arrow_path=None, df=None):
+    # Write the cleaned frame as an uncompressed Arrow IPC file (atomic replace)
+    arrow_path = arrow_path or columnar_path(csv_path)
+    if df is None:
+        df = read_medals_csv(csv_path)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), **_source_metadata(csv_path)})
+    tmp_path = arrow_path + ".tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, arrow_path)
+    return arrow_path
+
+
+def read_columnar(arrow_path):
+    with pa.memory_map(arrow_path) as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+def load_medals(csv_path):
+    # Memory-map the columnar copy; re-parse the CSV only when that copy is stale
+    if pa is None:
+        return read_medals_csv(csv_path)
+
+    arrow_path = columnar_path(csv_path)
+    if is_fresh(csv_path, arrow_path):
+        return read_columnar(arrow_path)
+
+    df = read_medals_csv(csv_path)
+    try:
+        ingest(csv_path, arrow_path, df=df)
+    except OSError:
+        pass  # Read-only deployment: keep serving from the CSV
+    return df
+
+
+def read_only(df):
+    # Same frame over read-only buffers (no copy of the data): an in-place write raises
+    # instead of silently changing what every other session sees
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = _frozen(np.asarray(series.cat.codes))
+            columns[col] = pd.Categorical.from_codes(codes, dtype=series.dtype)
+        elif isinstance(series.dtype, np.dtype):
+            columns[col] = _frozen(series.to_numpy())
+        else:
+            columns[col] = series.array  # Arrow-backed strings are immutable already
+    return pd.DataFrame(columns, copy=False)
+
+
+def _frozen(values):
+    if values.flags.writeable:
+        values = values.view()
+        values.flags.writeable = False
+    return values
+
+
+def _observed(col):
+    # Distinct non-null values of a (categorical) column, as strings
+    return [str(v) for v in pd.unique(col.dropna())]
+
+
+def _nations(noc_col):
+    # (nocs, countries) ordered by display name so ties resolve like an alphabetical groupby
+    nocs = sorted(set(_observed(noc_col)), key=lambda noc: (NOC_MAP.get(noc, noc), noc))
+    return nocs, [NOC_MAP.get(noc, noc) for noc in nocs]
+
+
+def _axis_codes(col, labels):
+    # Position of every value of col within labels (-1 if absent), via categorical codes
+    cat = col if isinstance(col.dtype, pd.CategoricalDtype) else col.astype('category')
+    lookup = pd.Index(labels).get_indexer(cat.cat.categories.astype(str))
+    codes = cat.cat.codes.to_numpy()
+    return np.where(codes >= 0, lookup[codes], -1)
+
+
+def _count(df, years, nocs, disciplines):
+    # Medal rows of df counted into a (year, NOC, discipline, medal) array laid out on the given axes
+    shape = (len(years), len(nocs), len(disciplines), len(MEDALS))
+    y = pd.Index(years).get_indexer(df['year'])
+    n = _axis_codes(df['noc'], nocs)
+    d = _axis_codes(df['discipline_clean'], disciplines)
+    m = _axis_codes(df['medal'], MEDALS)
+
+    keep = (y >= 0) & (n >= 0) & (d >= 0) & (m >= 0)  # Rows without a recognised medal carry no score
+    flat = np.ravel_multi_index((y[keep], n[keep], d[keep], m[keep]), shape)
+    return np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape).astype(np.int32)
+
+
+# ==========================================
+# Aggregate cube (year x NOC x discipline x medal)
+# ==========================================
+class MedalCube:
+    # Dense medal counts and scores for every (year, NOC, discipline, medal) cell.
+    # Built once per dataset from the event-level medal table (a team medal counts
+    # once); the aggregate views slice it instead of running groupbys over the
+    # row-level frame on every rerun.
+
+    def __init__(self, years, nocs, countries, disciplines, counts):
+        self.years = np.asarray(years)
+        self.nocs = list(nocs)
+        self.countries = list(countries)  # display name for each NOC, same order
+        self.disciplines = list(disciplines)
+        self.medals = list(MEDALS)
+        self.counts = _frozen(counts)
+        self.scores = _frozen(counts * np.array([MEDAL_SCORE[m] for m in self.medals], dtype=counts.dtype))
+
+        # year x nation matrices summed over disciplines once: one nation's series is a column slice
+        self.nation_counts = _frozen(counts.sum(axis=2))              # (year, nation, medal)
+        self.nation_totals = _frozen(self.scores.sum(axis=(2, 3)))    # (year, nation) score
+
+        self.year_pos = {int(y): i for i, y in enumerate(self.years)}
+        self.country_pos = {c: i for i, c in enumerate(self.countries)}
+
+    @classmethod
+    def from_frame(cls, df):
+        years = np.sort(df['year'].unique())
+        nocs, countries = _nations(df['noc'])
+        disciplines = sorted(_observed(df['discipline_clean']))
+        return cls(years, nocs, countries, disciplines, _count(df, years, nocs, disciplines))
+
+    def merged(self, delta):
+        # New cube with the delta rows added: cost ~ delta rows + cube cells, not history
+        years = np.union1d(self.years, delta['year'].unique())
+        nocs, countries = _nations(pd.Series(self.nocs + _observed(delta['noc'])))
+        disciplines = sorted(set(self.disciplines) | set(_observed(delta['discipline_clean'])))
+
+        counts = _count(delta, years, nocs, disciplines)
+        counts[np.ix_(
+            pd.Index(years).get_indexer(self.years),
+            pd.Index(nocs).get_indexer(self.nocs),
+            pd.Index(disciplines).get_indexer(self.disciplines),
+            np.arange(len(MEDALS)),
+        )] += self.counts
+        return MedalCube(years, nocs, countries, disciplines, counts)
+
+    def nation_scores(self, year):
+        # Total score per nation in one year (nations without medals left out)
+        i = self.year_pos.get(int(year))
+        if i is None:
+            return pd.Series(dtype='int64', name='score')
+        totals = self.nation_totals[i]
+        won = self.nation_counts[i].sum(axis=1) > 0
+        return pd.Series(totals[won], index=np.array(self.countries)[won], name='score')
+
+    def top_nations(self, year, n=5):
+        scores = self.nation_scores(year)
+        return scores.sort_values(ascending=False, kind='stable').head(n)
+
+    def top_nation(self, year):
+        scores = self.nation_scores(year)
+        return scores.idxmax() if not scores.empty else None
+
+    def score_history(self, country):
+        # Score per year for one nation, only the Games where it won something
+        j = self.country_pos.get(country)
+        if j is None:
+            return pd.DataFrame({'year': [], 'score': []})
+        totals = self.nation_totals[:, j]
+        won = self.nation_counts[:, j].sum(axis=1) > 0
+        return pd.DataFrame({'year': self.years[won], 'score': totals[won]})
+
+    def rank_matrix(self, order='gold'):
+        # year x nation rank for every Games at once (1 = first; 0 = no medal that year).
+        # 'gold': official table order (golds, then silvers, then bronzes); 'score': 3-2-1 points.
+        # Nations with the same key share a rank.
+        if order == 'score':
+            key = self.nation_totals.astype(np.int64)
+        else:
+            c = self.nation_counts.astype(np.int64)
+            base = int(c.max()) + 1
+            key = (c[..., 0] * base + c[..., 1]) * base + c[..., 2]
+
+        # Offset each year into its own key range, so one sort ranks all years together:
+        # rank = 1 + nations of the same year with a strictly larger key
+        n_years, n_nations = key.shape
+        span = int(key.max()) + 1
+        flat = (key + np.arange(n_years)[:, None] * span).ravel()
+        pos = np.searchsorted(np.sort(flat), flat, side='right').reshape(key.shape)
+        larger = np.arange(1, n_years + 1)[:, None] * n_nations - pos
+        won = self.nation_counts.sum(axis=2) > 0
+        return np.where(won, larger + 1, 0).astype(np.int32)
+
+    def compare(self, countries, metric='score'):
+        # Long (year, Country, metric) frame for several nations, only the Games each won something at.
+        # metric: 'score', 'Total' or a medal color
+        cols = [self.country_pos[c] for c in countries if c in self.country_pos]
+        counts = self.nation_counts[:, cols]
+        if metric == 'score':
+            values = self.nation_totals[:, cols]
+        elif metric == 'Total':
+            values = counts.sum(axis=2)
+        else:
+            values = counts[:, :, self.medals.index(metric)]
+        year_idx, col_idx = np.nonzero(counts.sum(axis=2) > 0)
+        return pd.DataFrame({
+            'year': self.years[year_idx],
+            'Country': np.array(self.countries)[cols][col_idx] if cols else np.array([], dtype=object),
+            metric: values[year_idx, col_idx],
+        })
+
+    def top_countries(self, n=10):
+        # Nations ranked by number of medals across all years (n=None: all of them)
+        totals = pd.Series(self.counts.sum(axis=(0, 2, 3)), index=self.countries)
+        ranked = totals[totals > 0].sort_values(ascending=False, kind='stable')
+        return ranked.index.tolist()[:n]
+
+
+def event_medals(df):
+    # Event-level medal table: one row per (year, discipline, event, NOC, medal)
+    return df.drop_duplicates(subset=EVENT_KEY)[EVENT_KEY + ['Country', 'score']].reset_index(drop=True)
+
+
+def medal_keys(medals):
+    return set(zip(*(medals[col].tolist() for col in EVENT_KEY)))
+
+
+class MedalKeys:
+    # Keys of the counted medals, shared by a chain of dataset versions. Every key
+    # remembers the version depth (len(version)) that counted it, so a delta adds its
+    # keys in place, O(delta), and an older version still only sees its own.
+
+    def __init__(self, keys, depth):
+        self._added = dict.fromkeys(keys, depth)
+        self._depth = depth  # Newest version this log belongs to
+
+    def counted(self, key, depth):
+        return self._added.get(key, depth + 1) <= depth
+
+    def extended(self, keys, depth):
+        # Log of version depth, built on version depth - 1
+        if self._depth != depth - 1:
+            # Branching off an older version (not what DatasetStore does): copy its keys
+            log = MedalKeys([key for key, added in self._added.items() if added < depth], depth - 1)
+            return log.extended(keys, depth)
+        for key in keys:
+            self._added.setdefault(key, depth)
+        self._depth = depth
+        return self
+
+
+def event_history(df):
+    # Group by Discipline, Event -> Get Min Year, Max Year
+    return df.groupby(['discipline_clean', 'event'], observed=True)['year'].agg(['min', 'max']).reset_index()
+
+
+def merge_event_history(history, delta):
+    # Fold the delta's events into an existing history (a few hundred rows, not the full data)
+    both = pd.concat([history, event_history(delta)], ignore_index=True)
+    for col in ['discipline_clean', 'event']:
+        both[col] = both[col].astype(str)
+    return both.groupby(['discipline_clean', 'event']).agg({'min': 'min', 'max': 'max'}).reset_index()
+
+
+# ==========================================
+# Incremental updates (delta files)
+# ==========================================
+# New results arrive as small CSVs in data_deltas/ next to data.csv, with the
+# same columns. DatasetStore applies each delta once on top of the dataset it
+# already holds: the cube and the event history are merged in O(delta), and
+# the row-level frame is only concatenated when something asks for it.
+# Editing data.csv itself (or changing/removing an applied delta) falls back
+# to a full reload.
+
+DELTA_DIR = "data_deltas"
+
+logger = logging.getLogger("milan2026.data")
+
+
+def validate_medals(df):
+    # Raise ValueError describing the first problem found in a delta
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"missing columns: {', '.join(missing)}")
+    empty = [c for c in REQUIRED_COLUMNS if df[c].isna().any()]
+    if empty:
+        raise ValueError(f"empty values in: {', '.join(empty)}")
+    if not pd.api.types.is_integer_dtype(df['year']):
+        raise ValueError("year must be an integer")
+    unknown = sorted(set(df['medal'].astype(str)) - set(MEDALS))
+    if unknown:
+        raise ValueError(f"unknown medal values: {', '.join(unknown)}")
+    duplicated = int(df.duplicated(subset=REQUIRED_COLUMNS).sum())
+    if duplicated:
+        raise ValueError(f"{duplicated} duplicated rows")
+    return df
+
+
+def invalid_medals(df):
+    # Row mask of what validate_medals objects to (empty values, non-integer year, unknown
+    # medal, repeated rows), so a batch can keep its good rows
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"missing columns: {', '.join(missing)}")
+    year = pd.to_numeric(df['year'], errors='coerce')
+    bad = df[REQUIRED_COLUMNS].isna().any(axis=1)
+    bad |= year.isna() | (year % 1 != 0)
+    bad |= ~df['medal'].astype(str).isin(MEDALS)
+    bad |= df.duplicated(subset=REQUIRED_COLUMNS)
+    return bad
+
+
+def read_delta(path):
+    df = validate_medals(pd.read_csv(path))
+    if 'type' not in df.columns:
+        df['type'] = 'Winter'
+    return prepare_medals(df[BASE_COLUMNS].copy())
+
+
+def concat_medals(frames):
+    # Row-concat that keeps categorical columns categorical (plain concat falls back to object)
+    if len(frames) == 1:
+        return frames[0]
+    # Categorical columns are joined on their codes; left in, concat would cast them to strings first
+    categorical = [col for col in CATEGORICAL_COLUMNS if col in frames[0].columns]
+    out = pd.concat([f.drop(columns=categorical) for f in frames], ignore_index=True)
+    for col in categorical:
+        out[col] = union_categoricals([f[col] for f in frames], sort_categories=True)
+    return out[list(frames[0].columns)]
+
+
+class RowIndex:
+    # Partition index over a frame sorted by (year, Country): every year and every
+    # (year, country) slice is one contiguous row range, so selecting it is an iloc
+    # slice instead of a boolean mask over all rows
+
+    def __init__(self, frame):
+        years = frame['year'].to_numpy()
+        codes = np.asarray(frame['Country'].cat.codes)
+        names = frame['Country'].cat.categories
+
+        self.spans = {}        # (year, country) -> (start, stop)
+        self.year_spans = {}   # year -> (start, stop)
+        if not len(frame):
+            return
+
+        boundary = (years[1:] != years[:-1]) | (codes[1:] != codes[:-1])
+        starts = np.r_[0, np.flatnonzero(boundary) + 1]
+        stops = np.r_[starts[1:], len(frame)]
+        for start, stop in zip(starts, stops):
+            year, code = int(years[start]), codes[start]
+            country = names[code] if code >= 0 else None
+            self.spans[(year, country)] = (int(start), int(stop))
+            self.year_spans[year] = (self.year_spans.get(year, (int(start),))[0], int(stop))
+
+    @staticmethod
+    def sort(frame, sorted_rows=0):
+        # Stable (year, Country) order the index relies on; rows keep their file order within a slice.
+        # When the first sorted_rows rows are already in that order (the previous version's frame),
+        # only the rows after them are sorted, then merged in behind their equals.
+        countries = frame['Country'].cat
+        keys = frame['year'].to_numpy().astype(np.int64) * (len(countries.categories) + 1) + (np.asarray(countries.codes) + 1)
+        done = keys[:sorted_rows]
+        if sorted_rows and np.all(done[1:] >= done[:-1]):
+            added = keys[sorted_rows:]
+            added_order = np.argsort(added, kind='stable')
+            dest = np.searchsorted(done, added[added_order], side='right') + np.arange(len(added))
+            kept = np.ones(len(frame), dtype=bool)
+            kept[dest] = False
+            order = np.empty(len(frame), dtype=np.intp)
+            order[kept] = np.arange(sorted_rows)
+            order[dest] = sorted_rows + added_order
+        else:
+            order = np.argsort(keys, kind='stable')
+        return frame.take(order).reset_index(drop=True)
+
+
+class MedalDataset:
+    # Immutable snapshot of the medal data: row chunks plus the aggregates built from them.
+    # version is hashable and changes with every applied delta (cache key for figures).
+    # One instance is shared by every session: its buffers are read-only and .frame
+    # hands out shallow views, so no session pays for (or can corrupt) a copy.
+
+    def __init__(self, chunks, medal_chunks, cube, events, version, keys=None, delta=None, sorted_rows=0):
+        self._chunks = list(chunks)
+        self._sorted_rows = sorted_rows  # Leading chunk rows already in (year, Country) order
+        self._medal_chunks = list(medal_chunks)
+        self.delta = delta  # Rows of the delta that produced this version (None for a full load)
+        self._frame = None
+        self._index = None
+        self._medals = None
+        self._lock = threading.Lock()
+        self.cube = cube
+        self.events = events
+        self.version = version
+        self._keys = keys if keys is not None else MedalKeys(medal_keys(self.medals), len(version))
+
+    @classmethod
+    def from_frame(cls, df, version):
+        medals = read_only(event_medals(df))
+        return cls([df], [medals], MedalCube.from_frame(medals), read_only(event_history(df)), version)
+
+    def _materialize(self):
+        # Concatenate the chunks, sort them into partitions and index them, once
+        if self._frame is None:
+            with self._lock:
+                if self._frame is None:
+                    frame = read_only(RowIndex.sort(concat_medals(self._chunks), self._sorted_rows))
+                    self._index = RowIndex(frame)
+                    self._frame = frame
+        return self._frame
+
+    def __len__(self):
+        # Row count, without building the frame
+        return sum(len(chunk) for chunk in self._chunks)
+
+    @property
+    def medal_count(self):
+        # len(self.medals), without building the table
+        return sum(len(chunk) for chunk in self._medal_chunks)
+
+    @property
+    def medals(self):
+        # Event-level medal table, what the aggregates count. Deltas append their new
+        # medals as chunks; they are concatenated once, when something reads the table.
+        if self._medals is None:
+            with self._lock:
+                if self._medals is None:
+                    self._medals = read_only(concat_medals(self._medal_chunks))
+        return self._medals
+
+    @property
+    def frame(self):
+        # Row-level frame, sorted by (year, Country). Each caller gets its own shallow
+        # view: adding a column to it never shows up in another session.
+        return self._materialize().copy(deep=False)
+
+    @property
+    def index(self):
+        self._materialize()
+        return self._index
+
+    def rows(self, year, country="All"):
+        # Medal rows of one year (optionally one nation): a slice, no scan
+        frame = self._materialize()
+        span = self._index.year_spans.get(int(year)) if country == "All" else self._index.spans.get((int(year), country))
+        start, stop = span or (0, 0)
+        return frame.iloc[start:stop]
+
+    @property
+    def latest_year(self):
+        return int(self.cube.years.max())
+
+    def with_delta(self, delta, delta_version):
+        # O(delta): the new rows and medals become chunks of their own, the key log grows in place.
+        # Medals already in the table (another member of a counted team) are not counted again.
+        # The sorted frame (if built) goes first, so the next sort only merges the new rows in
+        if self._frame is not None:
+            chunks, sorted_rows = [self._frame], len(self._frame)
+        else:
+            chunks, sorted_rows = self._chunks, self._sorted_rows
+        medal_chunks = [self._medals] if self._medals is not None else self._medal_chunks
+        depth = len(self.version)
+        candidates = event_medals(delta)
+        keys = list(zip(*(candidates[col].tolist() for col in EVENT_KEY)))
+        is_new = [not self._keys.counted(key, depth) for key in keys]
+        new_medals = read_only(candidates[is_new].reset_index(drop=True))
+        return MedalDataset(
+            chunks + [delta],
+            medal_chunks + [new_medals] if len(new_medals) else medal_chunks,
+            self.cube.merged(new_medals),
+            read_only(merge_event_history(self.events, delta)),
+            self.version + (delta_version,),
+            keys=self._keys.extended([key for key, new in zip(keys, is_new) if new], depth + 1),
+            delta=delta,
+            sorted_rows=sorted_rows,
+        )
+
+
+class DatasetStore:
+    # Current dataset for one CSV and its delta directory, shared by every session
+
+    def __init__(self, csv_path, delta_dir=None):
+        self.csv_path = csv_path
+        self.delta_dir = delta_dir or os.path.join(os.path.dirname(os.path.abspath(csv_path)), DELTA_DIR)
+        self.errors = {}  # delta file name -> why it was skipped
+        self._lock = threading.Lock()
+        self._dataset = None
+        self._base_version = None
+        self._applied = []  # (name, signature) of the delta files already looked at, in order
+
+    def delta_files(self):
+        # (name, signature) of the queued deltas, applied in name order
+        try:
+            names = sorted(n for n in os.listdir(self.delta_dir) if n.endswith(".csv"))
+        except FileNotFoundError:
+            return []
+        return [(name, file_signature(os.path.join(self.delta_dir, name))) for name in names]
+
+    def current(self):
+        base_version = file_signature(self.csv_path)
+        deltas = self.delta_files()
+        with self._lock:
+            # New files sort after the applied ones (_queue_path); anything else (an applied
+            # file changed or removed, one slipped in before them) means a full reload
+            if (self._dataset is None or self._base_version != base_version
+                    or deltas[:len(self._applied)] != self._applied):
+                self._dataset = MedalDataset.from_frame(load_medals(self.csv_path), (base_version,))
+                self._base_version = base_version
+                self._applied = []
+                self.errors = {}
+            for name, sig in deltas[len(self._applied):]:
+                self._apply(name, sig)
+            return self._dataset
+
+    def peek(self):
+        # Dataset as last loaded, without touching the file system (None before the first load)
+        return self._dataset
+
+    def _apply(self, name, sig):
+        self._applied.append((name, sig))
+        try:
+            delta = read_delta(os.path.join(self.delta_dir, name))
+        except (OSError, ValueError, pd.errors.ParserError) as e:
+            self.errors[name] = str(e)
+            logger.warning("skipped delta %s: %s", name, e)
+            return
+        start = time.perf_counter()
+        self._dataset = self._dataset.with_delta(delta, (name, sig))
+        logger.info("applied delta %s (%d rows) in %.1f ms", name, len(delta), (time.perf_counter() - start) * 1000)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(csv_path):
+    with _stores_lock:
+        store = _stores.get(csv_path)
+        if store is None:
+            store = _stores[csv_path] = DatasetStore(csv_path)
+        return store
+
+
+_queue_lock = threading.Lock()
+_last_stamp = 0
+
+
+def _queue_path(csv_path, name):
+    # Deltas are applied in name order, so names start with a UTC timestamp in nanoseconds
+    # that only moves forward: two appends in the same second (or a clock stepping back)
+    # still sort in queue order and never overwrite each other
+    global _last_stamp
+    delta_dir = DatasetStore(csv_path).delta_dir
+    os.makedirs(delta_dir, exist_ok=True)
+    with _queue_lock:
+        stamp = max(time.time_ns(), _last_stamp + 1)
+        while True:
+            seconds, ns = divmod(stamp, 10**9)
+            path = os.path.join(delta_dir, time.strftime("%Y%m%d-%H%M%S", time.gmtime(seconds)) + f".{ns:09d}_" + name)
+            if not os.path.exists(path) and not os.path.exists(path + ".tmp"):
+                break
+            stamp += 1
+        _last_stamp = stamp
+    return path
+
+
+def append_delta(src_path, csv_path="data.csv"):
+    # Validate a results file and queue it for the running dashboards; returns the queued path
+    read_delta(src_path)
+    dest = _queue_path(csv_path, os.path.basename(src_path))
+    shutil.copyfile(src_path, dest + ".tmp")
+    os.replace(dest + ".tmp", dest)  # Appears atomically, never half-written
+    return dest
+
+
+def queue_delta(df, name, csv_path="data.csv"):
+    # Same as append_delta, for rows already in memory
+    validate_medals(df)
+    dest = _queue_path(csv_path, name)
+    df.to_csv(dest + ".tmp", index=False)
+    os.replace(dest + ".tmp", dest)
+    return dest
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 2 and sys.argv[1] == "--append":
+        try:
+            print(f"Queued {append_delta(sys.argv[2], *sys.argv[3:4])}")
+        except ValueError as e:
+            sys.exit(f"Invalid delta: {e}")
+        sys.exit()
+
+    src = sys.argv[1] if len(sys.argv) > 1 else "data.csv"
+    if pa is None:
+        sys.exit("pyarrow is required to build the columnar file")
+    print(f"Wrote {ingest(src)}")
@@ -0,0 +1,113 @@
+import json
+import logging
+import time
+import uuid
+import weakref
+import zlib
+from collections import deque
+from contextlib import contextmanager
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from figures import compact_figure
+
+# ==========================================
+# Hot-path instrumentation
+# ==========================================
+# Every script run (full page or fragment) gets a RunProfile; each dashboard
+# section is wrapped in profile.section(...), which records wall time, the
+# bytes of the figures it sent and whether the figure cache hit. Records are
+# emitted as one JSON log line each (logger "milan2026.perf") and kept for
+# the opt-in debug panel (?debug=1).
+
+logger = logging.getLogger("milan2026.perf")
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+HISTORY_SIZE = 300
+
+# Serialized size per (immutable, cached) figure, computed once: id(fig) -> (weakref, bytes)
+_payload_sizes = {}
+
+
+def payload_bytes(fig):
+    # Bytes st.plotly_chart sends for this figure
+    key = id(fig)
+    entry = _payload_sizes.get(key)
+    if entry is not None and entry[0]() is fig:
+        return entry[1]
+    size = len(pio.to_json(fig, validate=False).encode())
+    try:
+        _payload_sizes[key] = (weakref.ref(fig, lambda _, key=key: _payload_sizes.pop(key, None)), size)
+    except TypeError:
+        pass
+    return size
+
+
+def payload_sizes(fig):
+    # Bytes of a freshly built figure as plain JSON, in the compact format, and the
+    # compact JSON deflated the way the websocket sends it
+    plain = pio.to_json(fig, validate=False).encode()
+    compact = pio.to_json(compact_figure(go.Figure(fig)), validate=False).encode()
+    return {'json': len(plain), 'compact': len(compact), 'wire': len(zlib.compress(compact))}
+
+
+class Section:
+
+    def __init__(self, name):
+        self.name = name
+        self.bytes = 0
+        self.cache = None
+
+    def add_figure(self, fig):
+        self.bytes += payload_bytes(fig)
+
+    def add_bytes(self, size):
+        self.bytes += size
+
+
+class RunProfile:
+
+    def __init__(self, scope, history=None):
+        self.scope = scope
+        self.run_id = uuid.uuid4().hex[:8]
+        self.records = []
+        self.history = history  # optional deque shared across runs (debug panel)
+
+    @contextmanager
+    def section(self, name, cache=None):
+        sec = Section(name)
+        before = cache.thread_stats() if cache is not None else None
+        start = time.perf_counter()
+        try:
+            yield sec
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if cache is not None:
+                hits, misses = (now - then for now, then in zip(cache.thread_stats(), before))
+                sec.cache = "miss" if misses else ("hit" if hits else None)
+            self._record(sec, elapsed_ms)
+
+    def _record(self, sec, elapsed_ms):
+        record = {
+            'ts': round(time.time(), 3),
+            'scope': self.scope,
+            'run': self.run_id,
+            'section': sec.name,
+            'ms': round(elapsed_ms, 2),
+            'bytes': sec.bytes,
+            'cache': sec.cache,
+        }
+        self.records.append(record)
+        if self.history is not None:
+            self.history.append(record)
+        logger.info(json.dumps(record, ensure_ascii=False))
+
+
+def new_history():
+    return deque(maxlen=HISTORY_SIZE)
@@ -0,0 +1,258 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from figures import FigureCache
+
+# ==========================================
+# Milan 2026 medal projection (Monte Carlo)
+# ==========================================
+# Fitted on the event-level medal cube (a team medal counts once), completed
+# Games only: TARGET_YEAR and anything after it (live results coming in) are
+# left out, so a partial 2026 neither enters the fit nor changes the cache key.
+#   - each nation's share of every (discipline, medal color) over the last
+#     WINDOW Games, recent Games weighted more (DECAY per edition)
+#   - medals on offer per (discipline, color) = what the latest completed Games awarded
+# Every simulation draws plausible shares from a Dirichlet around the fitted
+# ones (form is uncertain), then hands out the medals of each discipline with
+# a multinomial. All simulations of a chunk are one set of NumPy draws;
+# chunks have their own seeds, so results do not depend on how chunks are
+# spread over worker processes.
+#
+# Results are cached by a hash of the fitted history and the parameters, in
+# memory (the last MAX_RESULTS) and as projections/<hash>.npz (the newest
+# KEEP_FILES). Simulating happens in the warm-up or a background thread; the
+# dashboard only reads results (ready_projection) and never waits on a run.
+#
+#   python projection.py [--sims 20000] [--workers 4] [--country China]
+
+TARGET_YEAR = 2026  # Games being projected
+WINDOW = 5        # Games used for the fit
+DECAY = 0.6       # Weight of each older edition relative to the next one
+OTHERS_PRIOR = 0.5  # Dirichlet weight of "some nation without recent medals"
+SIMULATIONS = 20000
+CHUNK = 2000
+SEED = 2026
+
+MAX_RESULTS = 4   # Projections kept in memory
+KEEP_FILES = 4    # projections/*.npz kept on disk, most recently used first
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "projections")
+
+logger = logging.getLogger("milan2026.projection")
+
+# Concurrent requests for one key share a single run; other keys are not blocked
+_results = FigureCache(maxsize=MAX_RESULTS)
+_background = set()  # keys being computed by start_projection
+_background_lock = threading.Lock()
+
+
+# Completed Games the model is fitted on, limited to the nations and disciplines with medals in them
+History = namedtuple('History', ['years', 'countries', 'disciplines', 'counts'])
+
+
+def completed_history(cube, target_year=TARGET_YEAR):
+    done = cube.years < target_year
+    counts = cube.counts[done]                                      # (year, nation, discipline, medal)
+    nations = counts.sum(axis=(0, 2, 3)) > 0
+    disciplines = counts.sum(axis=(0, 1, 3)) > 0
+    return History(
+        years=[int(y) for y in cube.years[done]],
+        countries=[c for c, keep in zip(cube.countries, nations) if keep],
+        disciplines=[d for d, keep in zip(cube.disciplines, disciplines) if keep],
+        counts=counts[:, nations][:, :, disciplines],
+    )
+
+
+def fit(history, window=WINDOW, decay=DECAY):
+    # (alpha, medals on offer): alpha is (discipline, medal, nation + others) Dirichlet weights
+    recent = history.counts[-window:].astype(float)                 # (year, nation, discipline, medal)
+    weights = decay ** np.arange(len(recent))[::-1]                 # Latest Games weighs 1
+    weighted = np.tensordot(weights, recent, axes=1)                # (nation, discipline, medal)
+    alpha = np.concatenate([
+        weighted.transpose(1, 2, 0),                                # (discipline, medal, nation)
+        np.full(weighted.shape[1:] + (1,), OTHERS_PRIOR),
+    ], axis=2)
+    on_offer = history.counts[-1].sum(axis=0)                       # (discipline, medal)
+    return alpha, on_offer
+
+
+def simulate_chunk(alpha, on_offer, n_sims, seed):
+    # (n_sims, nation, medal) medal counts for one chunk of simulations
+    rng = np.random.default_rng(seed)
+    draws = rng.gamma(alpha, size=(n_sims,) + alpha.shape)         # Dirichlet via normalized gammas
+    shares = draws / draws.sum(axis=-1, keepdims=True)
+    medals = rng.multinomial(np.broadcast_to(on_offer, shares.shape[:-1]), shares)
+    return medals[..., :-1].sum(axis=1).transpose(0, 2, 1).astype(np.int16)  # Drop "others", sum disciplines
+
+
+class Projection:
+    # Simulated 2026 medal counts for every nation: sims is (simulation, nation, medal)
+
+    def __init__(self, countries, sims, key):
+        self.countries = list(countries)
+        self.sims = sims
+        self.key = key
+        self.country_pos = {c: i for i, c in enumerate(self.countries)}
+
+    def counts(self, country):
+        # (simulation, medal) for one nation, None if it has no history
+        j = self.country_pos.get(country)
+        return None if j is None else self.sims[:, j]
+
+    def summary(self, country, interval=0.8):
+        # Mean, median and central interval per medal color and in total
+        counts = self.counts(country)
+        if counts is None:
+            return None
+        columns = {'Gold': counts[:, 0], 'Silver': counts[:, 1], 'Bronze': counts[:, 2], 'Total': counts.sum(axis=1)}
+        lo, hi = (1 - interval) / 2, 1 - (1 - interval) / 2
+        return pd.DataFrame({
+            name: {
+                'mean': float(values.mean()),
+                'median': int(np.median(values)),
+                'low': int(np.quantile(values, lo)),
+                'high': int(np.quantile(values, hi)),
+            }
+            for name, values in columns.items()
+        }).T
+
+    def distribution(self, country, medal='Total'):
+        # Share of simulations ending with each medal count
+        counts = self.counts(country)
+        if counts is None:
+            return pd.Series(dtype=float)
+        values = counts.sum(axis=1) if medal == 'Total' else counts[:, ['Gold', 'Silver', 'Bronze'].index(medal)]
+        return pd.Series(values).value_counts(normalize=True).sort_index()
+
+    def table(self):
+        # Expected medals of every nation, gold-first order
+        means = self.sims.mean(axis=0)
+        table = pd.DataFrame(means, index=self.countries, columns=['Gold', 'Silver', 'Bronze'])
+        table['Total'] = table.sum(axis=1)
+        return table.sort_values(['Gold', 'Silver', 'Bronze'], ascending=False)
+
+
+def input_key(history, n_sims, seed):
+    # Hash of everything the result depends on
+    h = hashlib.sha1(np.ascontiguousarray(history.counts).tobytes())
+    h.update(repr((history.countries, history.disciplines, history.years,
+                   n_sims, seed, CHUNK, WINDOW, DECAY, OTHERS_PRIOR)).encode())
+    return h.hexdigest()[:16]
+
+
+def run(history, n_sims=SIMULATIONS, seed=SEED, workers=None):
+    alpha, on_offer = fit(history)
+    sizes = [min(CHUNK, n_sims - start) for start in range(0, n_sims, CHUNK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(simulate_chunk, [alpha] * len(sizes), [on_offer] * len(sizes), sizes, seeds))
+    else:
+        chunks = [simulate_chunk(alpha, on_offer, size, s) for size, s in zip(sizes, seeds)]
+    return np.concatenate(chunks)
+
+
+def _path(key):
+    return os.path.join(CACHE_DIR, f"{key}.npz")
+
+
+def prune(keep=KEEP_FILES):
+    # Drop all but the keep most recently used result files
+    try:
+        paths = [os.path.join(CACHE_DIR, name) for name in os.listdir(CACHE_DIR) if name.endswith(".npz")]
+        paths.sort(key=os.path.getmtime, reverse=True)
+        for path in paths[keep:]:
+            os.remove(path)
+    except OSError:
+        pass
+
+
+def _load_or_run(history, key, n_sims, seed, workers):
+    path = _path(key)
+    if os.path.exists(path):
+        with np.load(path) as saved:
+            sims = saved['sims']
+        try:
+            os.utime(path)  # Mark as recently used for prune()
+        except OSError:
+            pass
+    else:
+        sims = run(history, n_sims, seed, workers)
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            np.savez_compressed(path + ".tmp.npz", sims=sims)
+            os.replace(path + ".tmp.npz", path)
+            prune()
+        except OSError:
+            pass  # Read-only deployment: keep it in memory only
+    sims.flags.writeable = False
+    return Projection(history.countries, sims, key)
+
+
+def projection(cube, n_sims=SIMULATIONS, seed=SEED, workers=None):
+    # Cached Projection for this cube's completed Games: memory, then projections/<hash>.npz,
+    # then a fresh run (seconds: call it off the request path)
+    history = completed_history(cube)
+    key = input_key(history, n_sims, seed)
+    return _results.get(key, lambda: _load_or_run(history, key, n_sims, seed, workers))
+
+
+def start_projection(cube):
+    # Compute the default projection for cube in a background thread (once per key)
+    key = input_key(completed_history(cube), SIMULATIONS, SEED)
+    with _background_lock:
+        if key in _background:
+            return
+        _background.add(key)
+
+    def work():
+        try:
+            projection(cube)
+        except Exception:
+            logger.exception("projection failed")
+        finally:
+            with _background_lock:
+                _background.discard(key)
+
+    threading.Thread(target=work, name="milan2026-projection", daemon=True).start()
+
+
+def ready_projection(cube):
+    # For the page: the default projection if it is already computed (in memory or on
+    # disk), else None while a background thread computes it
+    history = completed_history(cube)
+    key = input_key(history, SIMULATIONS, SEED)
+    result = _results.peek(key)
+    if result is None and os.path.exists(_path(key)):
+        result = projection(cube)  # Only reads the file
+    if result is None:
+        start_projection(cube)
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from olympic_data import get_store
+
+    parser = argparse.ArgumentParser(description="Monte Carlo medal projection for the next Games")
+    parser.add_argument("--sims", type=int, default=SIMULATIONS)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--workers", type=int, help="worker processes (default: run in this process)")
+    parser.add_argument("--country", default="China")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = projection(get_store("data.csv").current().cube, args.sims, args.seed, args.workers)
+    print(f"{args.sims} simulations ({result.key}) in {time.perf_counter() - start:.2f} s\n")
+    print(result.table().head(10).round(1))
+    print(f"\n{args.country} (80% interval):")
+    print(result.summary(args.country))
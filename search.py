@@ -0,0 +1,206 @@
+import re
+import unicodedata
+from bisect import bisect_left
+
+import numpy as np
+
+from figures import FigureCache
+from olympic_data import concat_medals
+
+# ==========================================
+# Athlete / event search
+# ==========================================
+# Built once per dataset version: every athlete, event and discipline is an
+# entry, every word of its name (plus the athlete id) a token. Tokens are
+# kept sorted, so a query word is a prefix range found by bisection, and a
+# multi-word query intersects the entries of its words. Matching entries map
+# straight to their medal rows in the indexed frame, newest first. A delta
+# only indexes its own rows, as a layer over the previous version's index.
+
+MAX_RESULTS = 10
+SHORT_PREFIX = 2
+MAX_LAYERS = 16
+
+_EMPTY = np.empty(0, dtype=np.intp)
+
+# Athletes first, then events, then whole disciplines
+KIND_ORDER = {'athlete': 0, 'event': 1, 'discipline': 2}
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize(text):
+    # Case- and accent-insensitive form used for both the index and the query
+    text = unicodedata.normalize("NFKD", str(text).casefold())
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def words(text):
+    return _WORD_RE.findall(normalize(text))
+
+
+class SearchIndex:
+
+    def __init__(self, frame):
+        self.frame = frame
+
+        entries = []  # (kind, label, row positions newest first, key, extra tokens)
+        names = frame['as'].to_numpy()
+        for athlete_id, positions in frame.groupby('athlete_id', sort=False).indices.items():
+            entries.append(('athlete', names[positions[0]], positions[::-1], athlete_id, [str(athlete_id)]))
+        for (discipline, event), positions in frame.groupby(['discipline_clean', 'event'], observed=True).indices.items():
+            entries.append(('event', f"{event} ({discipline})", positions[::-1], (discipline, event), []))
+        for discipline, positions in frame.groupby('discipline_clean', observed=True).indices.items():
+            entries.append(('discipline', discipline, positions[::-1], discipline, []))
+        # Entry id = rank, so any sorted id array is already in result order
+        entries.sort(key=lambda e: (KIND_ORDER[e[0]], e[1]))
+        self.entries = [entry[:4] for entry in entries]
+        self.entry_ids = {(kind, key): i for i, (kind, _, _, key) in enumerate(self.entries)}
+
+        postings = {}  # token -> entry ids (ascending)
+        for entry_id, (_, label, _, _, extra) in enumerate(entries):
+            for token in set(words(label)) | set(extra):
+                postings.setdefault(token, []).append(entry_id)
+        self.tokens = sorted(postings)
+        self.postings = [np.array(postings[token]) for token in self.tokens]
+
+        # One- and two-letter prefixes cover huge token ranges: merge those once up front
+        short = {}
+        for token, ids in zip(self.tokens, self.postings):
+            for n in range(1, SHORT_PREFIX + 1):
+                if len(token) >= n:
+                    short.setdefault(token[:n], []).append(ids)
+        self.short = {prefix: np.unique(np.concatenate(parts)) for prefix, parts in short.items()}
+
+    def _prefix(self, word):
+        # Sorted ids of the entries with a token starting with word
+        if len(word) <= SHORT_PREFIX:
+            return self.short.get(word, _EMPTY)
+        start = bisect_left(self.tokens, word)
+        stop = bisect_left(self.tokens, word + "\uffff", start)
+        if stop == start:
+            return _EMPTY
+        return np.unique(np.concatenate(self.postings[start:stop]))
+
+    def matches(self, query):
+        # Entry ids matching every word of the query (as prefixes), best first
+        query_words = words(query)
+        if not query_words:
+            return []
+        found = None
+        for word in sorted(set(query_words), key=len, reverse=True):  # Longest word: smallest range first
+            ids = self._prefix(word)
+            found = ids if found is None else np.intersect1d(found, ids, assume_unique=True)
+            if not len(found):
+                return []
+        return found.tolist()
+
+    def groups(self, query):
+        # Matching entries best first, lazily: (rank, (kind, key), label, [(index, row positions)])
+        for entry_id in self.matches(query):
+            kind, label, positions, key = self.entries[entry_id]
+            yield (KIND_ORDER[kind], label), (kind, key), label, [(self, positions)]
+
+    def search(self, query, limit=MAX_RESULTS):
+        return search_rows(self.groups(query), limit)
+
+
+class LayeredIndex:
+    # Rows added by deltas, each delta indexed on its own and laid over the index of
+    # the rows before it: a new version only indexes its new rows, not the history.
+    # Past MAX_LAYERS the delta layers are folded into one (amortized O(delta rows)).
+
+    def __init__(self, base, layers):
+        self.base = base
+        self.layers = layers  # SearchIndex per delta, oldest first
+
+    def with_rows(self, frame):
+        layers = self.layers + (SearchIndex(frame),)
+        if len(layers) > MAX_LAYERS:
+            layers = (SearchIndex(concat_medals([layer.frame for layer in layers])),)
+        return LayeredIndex(self.base, layers)
+
+    def groups(self, query):
+        # Merge the (few) layer matches into the base matches in rank order; an entry
+        # found in several lists its newest rows first
+        recent = {}  # (kind, key) -> [rank, key, label, parts]
+        for layer in reversed(self.layers):
+            for rank, key, label, parts in layer.groups(query):
+                group = recent.get(key)
+                if group is None:
+                    recent[key] = [rank, key, label, parts]
+                else:  # Older rows go behind; the label is the oldest name, as in a full index
+                    group[0], group[2], group[3] = rank, label, group[3] + parts
+        pending = []
+        for rank, key, label, parts in recent.values():
+            entry_id = self.base.entry_ids.get(key)
+            if entry_id is not None:  # Known entry (e.g. an athlete under an earlier name): keep its label
+                label = self.base.entries[entry_id][1]
+                rank = (rank[0], label)
+            pending.append((rank, key, label, parts))
+        pending.sort(key=lambda group: group[0])
+        by_key = {group[1]: group for group in pending}
+        for rank, key, label, parts in self.base.groups(query):
+            while pending and pending[0][0] < rank:
+                by_key.pop(pending[0][1], None)
+                yield pending.pop(0)
+            group = by_key.pop(key, None)
+            if group is not None:
+                pending = [other for other in pending if other is not group]
+                parts = group[3] + parts
+            yield rank, key, label, parts
+        yield from pending
+
+    def search(self, query, limit=MAX_RESULTS):
+        return search_rows(self.groups(query), limit)
+
+
+def search_rows(groups, limit=MAX_RESULTS):
+    # Up to limit medal rows: dicts with what matched and where it sits (year / nation)
+    picked = []
+    for _, (kind, _), label, parts in groups:
+        for index, positions in parts:
+            picked.extend((kind, label, index, pos) for pos in positions[:limit - len(picked)])
+        if len(picked) >= limit:
+            break
+    if not picked:
+        return []
+
+    rows = {}  # One take per index, handed out in pick order
+    for index in {id(index): index for _, _, index, _ in picked}.values():
+        positions = np.array([pos for _, _, ix, pos in picked if ix is index])
+        rows[id(index)] = iter(index.frame.take(positions).to_dict('records'))
+    results = []
+    for kind, label, index, _ in picked:
+        row = next(rows[id(index)])
+        results.append({
+            'kind': kind,
+            'match': label,
+            'athlete': row['as'],
+            'event': row['event'],
+            'discipline': row['discipline_clean'],
+            'year': int(row['year']),
+            'noc': row['noc'],
+            'Country': row['Country'],
+            'medal': row['medal'],
+        })
+    return results
+
+
+SEARCH_CACHE = FigureCache(maxsize=2)
+
+
+def search_index(dataset):
+    # One index per dataset version, shared by all sessions
+    return SEARCH_CACHE.get(('search', dataset.version), lambda: build_index(dataset))
+
+
+def build_index(dataset):
+    # A version made by a delta only indexes the delta's rows on top of the previous
+    # version's index; everything else (first load, reload, evicted predecessor) indexes all rows
+    previous = SEARCH_CACHE.peek(('search', dataset.version[:-1])) if dataset.delta is not None else None
+    if previous is None:
+        return SearchIndex(dataset.frame)
+    if not isinstance(previous, LayeredIndex):
+        previous = LayeredIndex(previous, ())
+    return previous.with_rows(dataset.delta)
@@ -0,0 +1,32 @@
+import os
+from contextlib import asynccontextmanager
+
+import streamlit as st
+from starlette.middleware import Middleware
+
+import warmup
+from assets import StaticCacheHeaders
+
+# ==========================================
+# Server entry point
+# ==========================================
+# Streamlit's ASGI app around app.py. The server's startup hook starts the cache
+# warm-up, and /ready and /progress (see warmup.py) are served next to the
+# dashboard, so the load balancer sees it turn ready without anyone opening the
+# page first. Files under app/static get Cache-Control headers (see assets.py):
+#
+#   streamlit run serve.py [streamlit options]
+#   uvicorn serve:app --host 0.0.0.0 --port 8501
+#
+# Run it from the repository root: data.csv and .streamlit/config.toml are read from there.
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    warmup.start()
+    yield
+
+
+app = st.App(APP_PATH, lifespan=lifespan, routes=warmup.ROUTES, middleware=[Middleware(StaticCacheHeaders)])
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# The app modules live in the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from olympic_data import event_medals, read_medals_csv  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def medal_rows():
+    # Cleaned rows of data.csv, parsed from the CSV (the columnar copy is left alone)
+    return read_medals_csv(os.path.join(ROOT, "data.csv"))
+
+
+@pytest.fixture(scope="session")
+def medal_table(medal_rows):
+    return event_medals(medal_rows)
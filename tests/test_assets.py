@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+from assets import STATIC_CACHE_DEFAULT, STATIC_CACHE_IMMUTABLE, StaticCacheHeaders
+
+
+def response_headers(path, query=b"", status=200):
+    # Headers StaticCacheHeaders sends for a request to path, over a stub app
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": status, "headers": [(b"etag", b'"x"')]})
+        await send({"type": "http.response.body", "body": b""})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "path": path, "query_string": query}
+    asyncio.run(StaticCacheHeaders(app)(scope, None, send))
+    return dict(sent[0]["headers"])
+
+
+@pytest.mark.parametrize('path, query, expected', [
+    ("/app/static/theme.css", b"v=0123abcd", STATIC_CACHE_IMMUTABLE),
+    ("/app/static/theme.css", b"", STATIC_CACHE_DEFAULT),
+    ("/app/static/avatars/0123abcd_160.webp", b"", STATIC_CACHE_IMMUTABLE),
+    ("/base/app/static/fonts/Lato-Bold.woff2", b"", STATIC_CACHE_IMMUTABLE),
+    ("/app/static/snowflake.svg", b"", STATIC_CACHE_DEFAULT),
+])
+def test_static_cache_headers(path, query, expected):
+    headers = response_headers(path, query)
+    assert headers[b"cache-control"] == expected
+    assert headers[b"etag"] == b'"x"'
+
+
+def test_static_cache_headers_leave_other_responses_alone():
+    assert b"cache-control" not in response_headers("/app/static/missing.css", status=404)
+    assert b"cache-control" not in response_headers("/ready")
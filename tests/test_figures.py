@@ -0,0 +1,98 @@
+import base64
+import json
+import os
+
+import numpy as np
+import pytest
+
+import figures
+from china_forecast import read_china_forecast
+from conftest import ROOT
+from figures import (
+    build_medal_race, build_sunburst, build_treemap, compact_figure, full_id, short_code, treemap_levels,
+    treemap_nodes, treemap_rows,
+)
+from olympic_data import MedalCube
+
+
+@pytest.fixture(autouse=True)
+def compact_mode(monkeypatch):
+    monkeypatch.setattr(figures, 'COMPACT_FIGURES', True)
+
+
+def wire(fig):
+    # The figure as the browser receives it
+    return json.loads(fig.to_json())
+
+
+def decode(value):
+    # Plotly typed-array spec ({"dtype", "bdata"}) back to numbers
+    assert isinstance(value, dict) and 'bdata' in value, value
+    return np.frombuffer(base64.b64decode(value['bdata']), dtype=value['dtype'])
+
+
+def numbers(value):
+    # An uncompacted array: plain list, or a typed array plotly made from numpy input
+    return decode(value) if isinstance(value, dict) else np.asarray(value)
+
+
+def test_short_code_round_trip():
+    assert [short_code(n) for n in (0, 9, 10, 35, 36, 1295, 1296)] == ['0', '9', 'a', 'z', '10', 'zz', '100']
+    assert all(int(short_code(n), 36) == n for n in range(5000))
+
+
+def test_treemap_round_trip(medal_rows):
+    nodes = treemap_nodes(treemap_rows(medal_rows[medal_rows['year'] == 2022]), treemap_levels("All"), "All Events")
+    plain = wire(build_treemap(nodes))['data'][0]
+    compact = wire(compact_figure(build_treemap(nodes)))['data'][0]
+
+    # Ids and parents are codes of the node position; full_id maps every one back
+    assert compact['ids'] == [short_code(pos) for pos in range(len(nodes))]
+    assert [full_id(nodes['id'], code) for code in compact['ids']] == plain['ids']
+    assert [full_id(nodes['id'], code) for code in compact['parents']] == plain['parents']
+
+    # Numbers go out as typed arrays and decode to the same values (floats as float32,
+    # medal counts up to ~1300 in two bytes)
+    np.testing.assert_array_equal(decode(compact['values']), numbers(plain['values']))
+    assert decode(compact['values']).dtype == np.uint16
+    np.testing.assert_allclose(decode(compact['marker']['colors']), numbers(plain['marker']['colors']), rtol=1e-6)
+    assert decode(compact['marker']['colors']).dtype == np.float32
+
+
+def test_full_id_rejects_unknown_codes():
+    ids = ['All Events', 'All Events/Luge']
+    assert full_id(ids, '1') == 'All Events/Luge'
+    assert full_id(ids, 'zz') == ''
+    assert full_id(ids, 'not a code') == ''
+    assert full_id(ids, '') == ''
+
+
+def test_medal_race_frames_round_trip(medal_table):
+    cube = MedalCube.from_frame(medal_table)
+    plain = wire(build_medal_race(cube))
+    compact = wire(compact_figure(build_medal_race(cube)))
+
+    assert len(compact['frames']) == len(plain['frames'])
+    for before, after in zip(plain['frames'], compact['frames']):
+        bar, compact_bar = before['data'][0], after['data'][0]
+        assert compact_bar['ids'] == bar['ids']  # Bars keep their nation ids (no parents to recode)
+        for axis in ('x', 'y'):
+            np.testing.assert_allclose(decode(compact_bar[axis]), numbers(bar[axis]), rtol=1e-6)
+
+
+def test_sunburst_hover_has_no_codes():
+    china = read_china_forecast(os.path.join(ROOT, "china_data.csv"))
+    trace = wire(compact_figure(build_sunburst(china.sunburst_df, china.sport_color_map)))['data'][0]
+
+    # Ids went out as codes, so the tooltip must not print them
+    assert trace['ids'][0] == '0'
+    assert '%{id}' not in trace['hovertemplate'] and '%{parent}' not in trace['hovertemplate']
+    assert '%{label}' in trace['hovertemplate']
+
+
+def test_compact_mode_off(monkeypatch, medal_rows):
+    monkeypatch.setattr(figures, 'COMPACT_FIGURES', False)
+    nodes = treemap_nodes(treemap_rows(medal_rows[medal_rows['year'] == 2022]), treemap_levels("All"), "All Events")
+    fig = compact_figure(build_treemap(nodes))
+    assert list(fig.data[0].ids) == nodes['id'].tolist()
+    assert full_id(nodes['id'], 'All Events') == 'All Events'
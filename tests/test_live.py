@@ -0,0 +1,63 @@
+from streamlit.testing.v1 import AppTest
+
+from live import SESSION_POLL_MAX_S, SESSION_POLL_MIN_S, ResultsFeed
+
+
+def fragments_app():
+    # Two keyed fragments and a third one that reruns one of them (what live_watch does)
+    import streamlit as st
+
+    from live import rerun_fragments
+
+    runs = st.session_state.setdefault("runs", {"page": 0, "a": 0, "b": 0})
+    runs["page"] += 1
+
+    @st.fragment(key="a")
+    def a():
+        runs["a"] += 1
+        st.write("a")
+
+    @st.fragment(key="b")
+    def b():
+        runs["b"] += 1
+        st.write("b")
+
+    @st.fragment
+    def watch():
+        for target in ("a", "missing"):
+            if st.button(f"rerun {target}", key=f"rerun_{target}"):
+                rerun_fragments([target])
+
+    a()
+    b()
+    watch()
+
+
+def test_rerun_fragments_reruns_only_its_targets():
+    at = AppTest.from_function(fragments_app).run()
+    assert at.session_state["runs"] == {"page": 1, "a": 1, "b": 1}
+
+    at.button(key="rerun_a").click().run()
+    assert not at.exception
+    # The click reran the page once; the queued request then reran a alone
+    assert at.session_state["runs"] == {"page": 2, "a": 3, "b": 2}
+
+
+def test_rerun_fragments_unknown_key_reruns_the_page():
+    at = AppTest.from_function(fragments_app).run()
+    at.button(key="rerun_missing").click().run()
+    assert not at.exception
+    assert at.session_state["runs"] == {"page": 3, "a": 3, "b": 3}
+
+
+def test_session_poll_follows_the_feed(tmp_path):
+    feed = ResultsFeed(str(tmp_path / "feed.ndjson"), str(tmp_path / "data.csv"))
+    assert feed.session_poll_s() == SESSION_POLL_MAX_S  # Nothing arrived yet
+
+    feed.update_times.extend([100, 101, 102, 103])  # A batch every second
+    assert feed.session_poll_s(now=103.5) == SESSION_POLL_MIN_S
+    assert feed.session_poll_s(now=120) == 8             # Quiet for 17 s
+    assert feed.session_poll_s(now=1000) == SESSION_POLL_MAX_S
+
+    feed.update_times.extend([1000, 1020, 1040, 1060, 1080, 1100])  # Every 20 s
+    assert feed.session_poll_s(now=1101) == 8
@@ -0,0 +1,211 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import ROOT
+from olympic_data import (
+    BASE_COLUMNS, EVENT_KEY, MEDALS, DatasetStore, MedalCube, MedalDataset, RowIndex, concat_medals,
+    event_medals, prepare_medals, queue_delta, read_medals_csv,
+)
+
+
+def assert_same_cube(cube, expected):
+    np.testing.assert_array_equal(cube.years, expected.years)
+    assert cube.nocs == expected.nocs
+    assert cube.countries == expected.countries
+    assert cube.disciplines == expected.disciplines
+    np.testing.assert_array_equal(cube.counts, expected.counts)
+    np.testing.assert_array_equal(cube.nation_totals, expected.nation_totals)
+
+
+def milan_rows():
+    # A 2026 delta: a nation and a discipline the history has never seen, next to known ones
+    rows = [
+        (2026, 'Ski Mountaineering (Skiing)', 'Sprint, Men', 'A. Climber', 9000001, 'ZZZ', 'Gold'),
+        (2026, 'Ski Mountaineering (Skiing)', 'Sprint, Men', 'B. Climber', 9000002, 'CHN', 'Silver'),
+        (2026, 'Short Track Speed Skating (Skating)', '500 metres, Men', 'C. Skater', 9000003, 'ZZZ', 'Bronze'),
+        (2026, 'Short Track Speed Skating (Skating)', '500 metres, Men', 'D. Skater', 9000004, 'NOR', 'Gold'),
+    ]
+    df = pd.DataFrame(rows, columns=['year', 'discipline', 'event', 'as', 'athlete_id', 'noc', 'medal'])
+    return prepare_medals(df.assign(type='Winter')[BASE_COLUMNS])
+
+
+def milan_medals():
+    return event_medals(milan_rows())
+
+
+def split_event(medals):
+    # One whole event of 2018 comes in as the delta, the rest is history
+    year, discipline, event = medals.loc[medals['year'] == 2018, ['year', 'discipline_clean', 'event']].iloc[0]
+    mask = (medals['year'] == year) & (medals['discipline_clean'] == discipline) & (medals['event'] == event)
+    return medals[~mask], medals[mask]
+
+
+def test_event_medals_counts_individual_ties(medal_table):
+    # 1968 women's 500 m speed skating: one gold, three USA skaters tied for silver
+    women_500 = medal_table[(medal_table['year'] == 1968) & (medal_table['event'] == '500 metres, Women')]
+    assert sorted(zip(women_500['noc'], women_500['medal'])) == [('URS', 'Gold')] + [('USA', 'Silver')] * 3
+    # A hockey team is one medal, however many players are listed
+    hockey = medal_table[(medal_table['year'] == 2018) & (medal_table['event'] == 'Ice Hockey, Men')]
+    assert len(hockey) == 3 and set(hockey['entrant']) == {0}
+
+
+@pytest.mark.parametrize('split', ['existing year', 'new year', 'new nation and year'])
+def test_merged_matches_full_rebuild(medal_table, split):
+    if split == 'existing year':
+        history, delta = split_event(medal_table)
+    elif split == 'new year':
+        history, delta = medal_table[medal_table['year'] < 2022], medal_table[medal_table['year'] == 2022]
+    else:
+        history, delta = medal_table, milan_medals()
+
+    merged = MedalCube.from_frame(history).merged(delta)
+    assert_same_cube(merged, MedalCube.from_frame(concat_medals([history, delta])))
+
+
+def test_merged_adds_new_nation_and_year(medal_table):
+    cube = MedalCube.from_frame(medal_table).merged(milan_medals())
+    assert int(cube.years.max()) == 2026
+    assert 'ZZZ' in cube.nocs and 'Ski Mountaineering' in cube.disciplines
+    zzz = cube.nation_counts[cube.year_pos[2026], cube.nocs.index('ZZZ')]
+    assert dict(zip(MEDALS, zzz.tolist())) == {'Gold': 1, 'Silver': 0, 'Bronze': 1}
+
+
+@pytest.mark.parametrize('split', ['existing year', 'new nation and year', 'both'])
+def test_row_index_merge_matches_fresh_sort(medal_rows, split):
+    # The previous version's sorted frame first, the delta rows merged in behind it
+    year_2018 = medal_rows['year'] == 2018
+    history, delta = medal_rows[~year_2018], medal_rows[year_2018]
+    if split == 'new nation and year':
+        history, delta = medal_rows, milan_rows()
+    elif split == 'both':
+        delta = concat_medals([milan_rows(), delta])
+    chunks = [RowIndex.sort(history), delta]
+
+    merged = RowIndex.sort(concat_medals(chunks), sorted_rows=len(history))
+    fresh = RowIndex.sort(concat_medals(chunks))
+    pd.testing.assert_frame_equal(merged, fresh)
+
+    index, expected = RowIndex(merged), RowIndex(fresh)
+    assert index.spans == expected.spans and index.year_spans == expected.year_spans
+    for (year, country), (start, stop) in expected.spans.items():
+        pd.testing.assert_frame_equal(merged.iloc[slice(*index.spans[year, country])], fresh.iloc[start:stop])
+
+
+def plain(df, by=None):
+    # Values only: categories, dtypes and row labels differ between the two paths
+    df = df.astype(object)
+    if by:
+        df = df.sort_values(by, kind='stable')
+    return df.reset_index(drop=True)
+
+
+def test_store_deltas_match_full_rebuild(tmp_path):
+    # data.csv without four events, then those events arrive one delta file at a time
+    raw = pd.read_csv(os.path.join(ROOT, "data.csv"))
+    deltas = []
+    for year, nth in [(2018, 0), (2022, 0), (2022, 1), (1968, 0)]:
+        event = raw.loc[raw['year'] == year, 'event'].drop_duplicates().iloc[nth]
+        mask = (raw['year'] == year) & (raw['event'] == event)
+        deltas.append(raw[mask])
+        raw = raw[~mask]
+    # Another member of a team already counted: a row, but no new medal
+    deltas.append(raw[raw['event'] == 'Ice Hockey, Men'].head(1))
+    raw.to_csv(tmp_path / "data.csv", index=False)
+
+    store = DatasetStore(str(tmp_path / "data.csv"))
+    os.makedirs(store.delta_dir)
+    for i, delta in enumerate(deltas):
+        delta.to_csv(os.path.join(store.delta_dir, f"{i:02d}.csv"), index=False)
+        dataset = store.current()
+        if i == 1:
+            dataset.frame, dataset.medals  # Built in between: the next delta merges into them
+    assert len(dataset.version) == 1 + len(deltas) and not store.errors
+
+    full_csv = tmp_path / "full.csv"
+    pd.concat([raw] + deltas).to_csv(full_csv, index=False)
+    full = MedalDataset.from_frame(read_medals_csv(full_csv), ('full',))
+
+    assert_same_cube(dataset.cube, full.cube)
+    pd.testing.assert_frame_equal(plain(dataset.events, ['discipline_clean', 'event']),
+                                  plain(full.events, ['discipline_clean', 'event']))
+    pd.testing.assert_frame_equal(plain(dataset.medals, EVENT_KEY), plain(full.medals, EVENT_KEY))
+    assert dataset.medal_count == len(full.medals)
+    pd.testing.assert_frame_equal(plain(dataset.frame), plain(full.frame))
+    assert dataset.index.spans == full.index.spans
+    for year, country in full.index.spans:
+        pd.testing.assert_frame_equal(plain(dataset.rows(year, country)), plain(full.rows(year, country)))
+
+
+def test_store_current_applies_queued_deltas_in_order(tmp_path):
+    raw = pd.read_csv(os.path.join(ROOT, "data.csv"))
+    raw[raw['year'] < 2022].to_csv(tmp_path / "data.csv", index=False)
+    csv_path = str(tmp_path / "data.csv")
+    store = DatasetStore(csv_path)
+    base = store.current()
+
+    # Queued within the same second, under the same name: every file kept, in queue order
+    year = raw[raw['year'] == 2022]
+    events = [year[year['event'] == event] for event in year['event'].unique()[:6]]
+    paths = [queue_delta(delta, "results.csv", csv_path) for delta in events[:5]]
+    names = [os.path.basename(path) for path in paths]
+    assert len(set(names)) == len(names) and [name for name, _ in store.delta_files()] == names
+
+    dataset = store.current()
+    assert dataset.version[0] == base.version[0] and [name for name, _ in dataset.version[1:]] == names
+    assert store.current() is dataset  # Nothing new, nothing to do
+    def medal_count(rows):
+        return len(event_medals(prepare_medals(rows[BASE_COLUMNS])))
+    assert dataset.medal_count == base.medal_count + medal_count(pd.concat(events[:5]))
+
+    # A later delta goes on top of the same chain
+    queue_delta(events[5], "late.csv", csv_path)
+    assert store.current().version[:len(dataset.version)] == dataset.version
+
+    # Editing an applied delta reloads from data.csv, then applies every file again
+    events[0].head(1).to_csv(paths[0], index=False)
+    reloaded = store.current()
+    assert len(reloaded.version) == 1 + 6 and reloaded.version[1][1] != dataset.version[1][1]
+    assert reloaded.medal_count == dataset.medal_count - medal_count(events[0]) + 1 + medal_count(events[5])
+
+
+# ==========================================
+# rank_matrix
+# ==========================================
+def expected_ranks(cube, order):
+    # pandas min-rank (ties share the best place) per year, over the nations that won something
+    counts = cube.nation_counts.astype(np.int64)
+    if order == 'score':
+        key = cube.nation_totals
+    else:
+        key = (counts[..., 0] * 10**4 + counts[..., 1]) * 10**4 + counts[..., 2]
+    ranks = np.zeros(key.shape, dtype=np.int64)
+    for i in range(len(cube.years)):
+        won = counts[i].sum(axis=1) > 0
+        ranks[i, won] = pd.Series(key[i, won]).rank(method='min', ascending=False).astype(np.int64)
+    return ranks
+
+
+@pytest.mark.parametrize('order', ['gold', 'score'])
+def test_rank_matrix_matches_pandas(medal_table, order):
+    cube = MedalCube.from_frame(medal_table)
+    np.testing.assert_array_equal(cube.rank_matrix(order), expected_ranks(cube, order))
+
+
+def test_rank_matrix_ties():
+    # 2018: AAA and BBB tie on one gold; CCC has more medals but no gold. 2022: DDD only.
+    counts = np.zeros((2, 4, 1, 3), dtype=np.int32)
+    counts[0, 0, 0] = counts[0, 1, 0] = [1, 0, 0]
+    counts[0, 2, 0] = [0, 2, 1]
+    counts[1, 3, 0] = [0, 0, 1]
+    nocs = ['AAA', 'BBB', 'CCC', 'DDD']
+    cube = MedalCube([2018, 2022], nocs, nocs, ['X'], counts)
+
+    gold = cube.rank_matrix('gold')
+    np.testing.assert_array_equal(gold, [[1, 1, 3, 0], [0, 0, 0, 1]])
+    score = cube.rank_matrix('score')
+    np.testing.assert_array_equal(score, [[2, 2, 1, 0], [0, 0, 0, 1]])
+    for order in ('gold', 'score'):
+        np.testing.assert_array_equal(cube.rank_matrix(order), expected_ranks(cube, order))
@@ -0,0 +1,40 @@
+import pytest
+
+import search
+from olympic_data import concat_medals
+from search import LayeredIndex, SearchIndex
+
+QUERIES = ['ski', 'relay', '500 metres', 'bjorn', 'johannes', 'ice hockey', 'team sprint', 'gu', 'zz']
+
+
+def groups(index, query):
+    # Everything a query yields, with the row positions resolved to the rows themselves
+    out = []
+    for rank, key, label, parts in index.groups(query):
+        rows = [row for part, positions in parts for row in part.frame.take(positions)[['as', 'year', 'event', 'noc', 'medal']].itertuples(index=False)]
+        out.append((rank, key, label, rows))
+    return out
+
+
+def split_deltas(medal_rows, count):
+    # History without the last Games, which then arrives as count deltas
+    latest = medal_rows['year'] == medal_rows['year'].max()
+    history, last = medal_rows[~latest].reset_index(drop=True), medal_rows[latest].reset_index(drop=True)
+    bounds = [len(last) * i // count for i in range(count + 1)]
+    return history, [last.iloc[start:stop].reset_index(drop=True) for start, stop in zip(bounds, bounds[1:])]
+
+
+@pytest.mark.parametrize('max_layers', [16, 2])
+def test_layered_index_matches_full_rebuild(monkeypatch, medal_rows, max_layers):
+    monkeypatch.setattr(search, 'MAX_LAYERS', max_layers)  # 2: the layers get folded on the way
+    history, deltas = split_deltas(medal_rows, 5)
+
+    index = LayeredIndex(SearchIndex(history), ())
+    for delta in deltas:
+        index = index.with_rows(delta)
+    assert len(index.layers) == (5 if max_layers == 16 else 1)
+
+    full = SearchIndex(concat_medals([history] + deltas))
+    for query in QUERIES:
+        assert groups(index, query) == groups(full, query), query
+        assert index.search(query) == full.search(query)
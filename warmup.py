@@ -0,0 +1,163 @@
+import logging
+import os
+import sys
+import threading
+import time
+
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from china_forecast import read_china_forecast
+from figures import (
+    FIGURE_CACHE, RACE_ORDERS, country_options, medal_race_figure, overview_figures, program_tree_json,
+    sunburst_figure, view_rows,
+)
+from olympic_data import file_signature, get_store
+from projection import projection
+from search import search_index
+
+# ==========================================
+# Cache warm-up
+# ==========================================
+# Fills the shared, process-wide caches (dataset, search index, projection,
+# evolution tree, medal race, sunburst and every (year, country) overview)
+# in a background thread, newest Games and "All" first. serve.py mounts the
+# readiness routes for the load balancer on the dashboard's own port:
+#
+#   GET /ready      200 once everything is warm, 503 before
+#   GET /progress   {"state", "done", "total", "elapsed_s", ...}
+#
+#   streamlit run serve.py [options]   -> warm-up starts with the server (serve.py)
+#   python warmup.py [options]         -> the same, via streamlit's CLI
+#
+# A plain `streamlit run app.py` has neither the startup hook nor the routes:
+# there the warm-up only starts with the first page view.
+
+DATA_PATH = "data.csv"
+CHINA_PATH = "china_data.csv"
+
+logger = logging.getLogger("milan2026.warmup")
+
+
+class Warmup:
+
+    def __init__(self, csv_path=DATA_PATH, china_path=CHINA_PATH):
+        self.csv_path = csv_path
+        self.china_path = china_path
+        self.state = "starting"
+        self.done = 0
+        self.total = None
+        self.error = None
+        self.version = None
+        self.started = time.time()
+        self.finished = None
+        self._thread = threading.Thread(target=self._run, name="milan2026-warmup", daemon=True)
+
+    @property
+    def ready(self):
+        return self.state == "ready"
+
+    def progress(self):
+        end = self.finished or time.time()
+        return {
+            'state': self.state,
+            'done': self.done,
+            'total': self.total,
+            'elapsed_s': round(end - self.started, 1),
+            'version': repr(self.version),
+            'error': self.error,
+        }
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def tasks(self, dataset):
+        # (name, fn) in the order viewers are most likely to need them
+        cube, version = dataset.cube, dataset.version
+        tasks = [
+            ("search_index", lambda: search_index(dataset)),
+            ("evolution_tree", lambda: program_tree_json(version, dataset.events, dataset.latest_year)),
+        ]
+        tasks += [(f"medal_race:{order}", lambda order=order: medal_race_figure(version, cube, order)) for order in RACE_ORDERS]
+
+        china_version = file_signature(self.china_path)
+        tasks.append(("sunburst", lambda: sunburst_figure(china_version, read_china_forecast(self.china_path))))
+        tasks.append(("projection", lambda: projection(cube)))
+
+        # Overviews: every nation the filter offers, for the Games it has medal rows in
+        views = []
+        for year in sorted((int(y) for y in cube.years), reverse=True):
+            for country in country_options(cube):
+                if country == "All" or (year, country) in dataset.index.spans:
+                    views.append((year, country))
+        views = views[:max(FIGURE_CACHE.maxsize - 64, 0)]  # Leave room for interactive misses
+        tasks += [
+            (f"overview:{year}:{country}",
+             lambda year=year, country=country: overview_figures(
+                 version, view_rows(dataset, year, country), cube, year, country))
+            for year, country in views
+        ]
+        return tasks
+
+    def _run(self):
+        try:
+            self.state = "warming"
+            dataset = get_store(self.csv_path).current()
+            self.version = dataset.version
+            dataset.index  # Row frame + partition index
+            tasks = self.tasks(dataset)
+            self.total = len(tasks) + 1
+            self.done = 1
+            for name, fn in tasks:
+                fn()
+                self.done += 1
+            self.state = "ready"
+            logger.info("warm-up finished: %d tasks in %.1f s", self.total, time.time() - self.started)
+        except Exception as e:
+            self.state = "failed"
+            self.error = f"{type(e).__name__}: {e}"
+            logger.exception("warm-up failed")
+        finally:
+            self.finished = time.time()
+
+
+_warmup = None
+_warmup_lock = threading.Lock()
+
+
+def start(csv_path=DATA_PATH, china_path=CHINA_PATH):
+    # The process-wide warm-up (started on first call)
+    global _warmup
+    with _warmup_lock:
+        if _warmup is None:
+            _warmup = Warmup(csv_path, china_path).start()
+        return _warmup
+
+
+# --- Readiness routes (mounted by serve.py) ---
+def _json(body, status_code=200):
+    return JSONResponse(body, status_code=status_code, headers={"Cache-Control": "no-store"})
+
+
+async def ready(request):
+    is_ready = _warmup is not None and _warmup.ready
+    return _json({'ready': is_ready}, 200 if is_ready else 503)
+
+
+async def progress(request):
+    if _warmup is None:
+        return _json({'state': "not started"})
+    return _json(_warmup.progress())
+
+
+ROUTES = [Route("/ready", ready, methods=["GET"]), Route("/progress", progress, methods=["GET"])]
+
+
+if __name__ == "__main__":
+    from streamlit.web import cli as stcli
+
+    # Data paths and .streamlit/config.toml are relative to the repo, like for `streamlit run app.py`
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    sys.argv = ["streamlit", "run", "serve.py"] + sys.argv[1:]
+    sys.exit(stcli.main())